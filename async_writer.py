@@ -0,0 +1,138 @@
+import gzip
+import os
+import pickle
+import random
+import tempfile
+import threading
+from neat.checkpoint import Checkpointer
+from neat.population import Population
+
+
+# Replace path with data in one step: write a temp file next to it, fsync,
+# then rename over the old file, so readers never see a partial file
+def write_atomic(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# Writes files on a daemon thread so disk latency never stalls the caller.
+# The caller only pickles (the snapshot); compression and I/O happen in the
+# background. A newer snapshot for a path that is still queued replaces the
+# queued one, so repeated "best so far" saves cost one write.
+class BackgroundWriter:
+    def __init__(self):
+        self.pending = {}
+        self.writing = False
+        self.closed = False
+        self.error = None
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+        self.thread.start()
+
+    def dump(self, path, obj, compress=False):
+        self.submit(path, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), compress)
+
+    def submit(self, path, data, compress=False):
+        with self.cond:
+            self._raise_error()
+            if self.closed:
+                raise RuntimeError("BackgroundWriter is closed")
+            self.pending.pop(path, None)
+            self.pending[path] = (data, compress)
+            self.cond.notify_all()
+
+    def flush(self):
+        with self.cond:
+            while self.pending or self.writing:
+                self.cond.wait()
+            self._raise_error()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending and not self.closed:
+                    self.cond.wait()
+                if not self.pending:
+                    return
+                path = next(iter(self.pending))
+                data, compress = self.pending.pop(path)
+                self.writing = True
+            try:
+                write_atomic(path, gzip.compress(data, compresslevel=5) if compress else data)
+            except Exception as e:
+                self.error = e
+            with self.cond:
+                self.writing = False
+                self.cond.notify_all()
+
+
+# Checkpointer that hands the gzip-pickle write to a BackgroundWriter. Files
+# have Checkpointer's layout; with a state_function, whatever it returns is
+# appended to the saved tuple as a sixth item, which restore_checkpoint below
+# hands back. state_function is not saved with the reporters: whoever
+# restores a checkpoint sets it again (see train_agent.resume).
+class AsyncCheckpointer(Checkpointer):
+    def __init__(self, writer, generation_interval=100, time_interval_seconds=300,
+                 filename_prefix="neat-checkpoint-", state_function=None):
+        super().__init__(generation_interval, time_interval_seconds, filename_prefix)
+        self.writer = writer
+        self.state_function = state_function
+
+    def save_checkpoint(self, config, population, species_set, generation):
+        filename = "{0}{1}".format(self.filename_prefix, generation)
+        print("Saving checkpoint to {0}".format(filename))
+
+        data = (generation, config, population, species_set, random.getstate())
+        if self.state_function is not None:
+            data += (self.state_function(),)
+        if self.writer is None:
+            write_atomic(filename, gzip.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), compresslevel=5))
+        else:
+            self.writer.dump(filename, data, compress=True)
+
+    # Returns (population, extra state or None). Unlike
+    # Checkpointer.restore_checkpoint, the population continues with the
+    # generation after the saved one, and the reporters saved with the species
+    # set are re-attached, so statistics and checkpoints carry on.
+    @staticmethod
+    def restore_checkpoint(filename):
+        with gzip.open(filename) as f:
+            generation, config, population, species_set, rndstate, *extra = pickle.load(f)
+        p = Population(config, (population, species_set, generation + 1))
+        for reporter in species_set.reporters.reporters:
+            p.add_reporter(reporter)
+        species_set.reporters = p.reporters
+        random.setstate(rndstate)
+        return p, extra[0] if extra else None
+
+    # The species set's reporters are saved inside every checkpoint; the
+    # writer thread cannot be pickled, so a restored copy writes synchronously
+    # until it is given a writer again. The state function is dropped too: a
+    # pickled reference would point at whichever module wrote the checkpoint
+    # (often __main__), not at the trainer that restores it.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["writer"] = None
+        state["state_function"] = None
+        return state
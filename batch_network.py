@@ -0,0 +1,300 @@
+import math
+import numpy as np
+
+
+# neat-python's built-in activations on plain floats: the same clamping and
+# the same math calls, for code that evaluates one network at a time
+def _sigmoid(z):
+    return 1.0 / (1.0 + math.exp(-max(-60.0, min(60.0, 5.0 * z))))
+
+def _tanh(z):
+    return math.tanh(max(-60.0, min(60.0, 2.5 * z)))
+
+def _sin(z):
+    return math.sin(max(-60.0, min(60.0, 5.0 * z)))
+
+def _gauss(z):
+    return math.exp(-5.0 * max(-3.4, min(3.4, z)) ** 2)
+
+def _relu(z):
+    return z if z > 0.0 else 0.0
+
+def _softplus(z):
+    return 0.2 * math.log(1 + math.exp(max(-60.0, min(60.0, 5.0 * z))))
+
+def _identity(z):
+    return z
+
+def _clamped(z):
+    return max(-1.0, min(1.0, z))
+
+def _inv(z):
+    return 1.0 / z if z != 0.0 else 0.0
+
+def _log(z):
+    return math.log(max(1e-7, z))
+
+def _exp(z):
+    return math.exp(max(-60.0, min(60.0, z)))
+
+def _abs(z):
+    return abs(z)
+
+def _hat(z):
+    return max(0.0, 1 - abs(z))
+
+def _square(z):
+    return z ** 2
+
+def _cube(z):
+    return z ** 3
+
+SCALAR_ACTIVATIONS = {
+    "sigmoid": _sigmoid, "tanh": _tanh, "sin": _sin, "gauss": _gauss,
+    "relu": _relu, "softplus": _softplus, "identity": _identity,
+    "clamped": _clamped, "inv": _inv, "log": _log, "exp": _exp,
+    "abs": _abs, "hat": _hat, "square": _square, "cube": _cube,
+}
+
+
+# The same activations vectorized with NumPy, for BatchNetwork. NumPy's exp,
+# tanh, log and powers may round differently from the math module (by an ulp
+# or so), so batched outputs agree with FeedForwardNetwork closely (within
+# about 1e-12 relative on evolved networks), not bit for bit.
+def _sigmoid_array(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0)))
+
+def _tanh_array(z):
+    return np.tanh(np.clip(2.5 * z, -60.0, 60.0))
+
+def _sin_array(z):
+    return np.sin(np.clip(5.0 * z, -60.0, 60.0))
+
+def _gauss_array(z):
+    return np.exp(-5.0 * np.clip(z, -3.4, 3.4) ** 2)
+
+def _relu_array(z):
+    return np.where(z > 0.0, z, 0.0)
+
+def _softplus_array(z):
+    return 0.2 * np.log(1 + np.exp(np.clip(5.0 * z, -60.0, 60.0)))
+
+def _clamped_array(z):
+    return np.clip(z, -1.0, 1.0)
+
+def _inv_array(z):
+    with np.errstate(divide="ignore", over="ignore"):
+        return np.where(z != 0.0, 1.0 / np.where(z != 0.0, z, 1.0), 0.0)
+
+def _log_array(z):
+    return np.log(np.maximum(z, 1e-7))
+
+def _exp_array(z):
+    return np.exp(np.clip(z, -60.0, 60.0))
+
+def _hat_array(z):
+    return np.maximum(0.0, 1 - np.abs(z))
+
+def _square_array(z):
+    return z ** 2
+
+def _cube_array(z):
+    return z ** 3
+
+# A node's activation is stored as its index in ACTIVATIONS
+ACTIVATIONS = [
+    ("sigmoid", _sigmoid_array), ("tanh", _tanh_array), ("sin", _sin_array),
+    ("gauss", _gauss_array), ("relu", _relu_array), ("softplus", _softplus_array),
+    ("identity", _identity), ("clamped", _clamped_array), ("inv", _inv_array),
+    ("log", _log_array), ("exp", _exp_array), ("abs", np.abs),
+    ("hat", _hat_array), ("square", _square_array), ("cube", _cube_array),
+]
+ACTIVATION_IDS = {name: i for i, (name, _) in enumerate(ACTIVATIONS)}
+
+
+# One genome's phenotype as flat arrays. Value slots are laid out as
+# [inputs..., zero, evaluated nodes...]; nodes are in evaluation order with
+# their layer depth, and each node's incoming links are the CSR range
+# link_start[j]:link_start[j + 1] of link_src (value slots) / link_weight.
+# Outputs that no path reaches read the zero slot, as in FeedForwardNetwork.
+class CompiledNetwork:
+    def __init__(self, num_inputs, node_depth, bias, response, activation,
+                 link_start, link_src, link_weight, output_slots):
+        self.num_inputs = num_inputs
+        self.node_depth = np.asarray(node_depth, dtype=np.int32)
+        self.bias = np.asarray(bias, dtype=float)
+        self.response = np.asarray(response, dtype=float)
+        self.activation = np.asarray(activation, dtype=np.int32)
+        self.link_start = np.asarray(link_start, dtype=np.int32)
+        self.link_src = np.asarray(link_src, dtype=np.int32)
+        self.link_weight = np.asarray(link_weight, dtype=float)
+        self.output_slots = np.asarray(output_slots, dtype=np.int32)
+        self._batch = None
+
+    @property
+    def num_nodes(self):
+        return len(self.node_depth)
+
+    @property
+    def num_outputs(self):
+        return len(self.output_slots)
+
+    def activate(self, inputs):
+        if self._batch is None:
+            self._batch = BatchNetwork([self])
+        return self._batch.activate(np.asarray([inputs], dtype=float))[0].tolist()
+
+
+def compile_genome(genome, config):
+    from neat.graphs import feed_forward_layers
+
+    gc = config.genome_config
+    connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+    layers = feed_forward_layers(gc.input_keys, gc.output_keys, connections)
+
+    slot = {key: i for i, key in enumerate(gc.input_keys)}
+    zero_slot = len(gc.input_keys)
+    node_depth, bias, response, activation = [], [], [], []
+    link_start, link_src, link_weight = [0], [], []
+
+    for depth, layer in enumerate(layers):
+        for node in layer:
+            ng = genome.nodes[node]
+            if ng.aggregation != "sum":
+                raise ValueError(f"Cannot compile aggregation {ng.aggregation!r}, only 'sum'")
+            if ng.activation not in ACTIVATION_IDS:
+                raise ValueError(f"Cannot compile activation {ng.activation!r}")
+
+            # Same link order as FeedForwardNetwork.create, so sums match
+            for inode, onode in connections:
+                if onode == node:
+                    link_src.append(slot[inode])
+                    link_weight.append(genome.connections[(inode, onode)].weight)
+            link_start.append(len(link_src))
+
+            slot[node] = zero_slot + 1 + len(node_depth)
+            node_depth.append(depth)
+            bias.append(ng.bias)
+            response.append(ng.response)
+            activation.append(ACTIVATION_IDS[ng.activation])
+
+    output_slots = [slot.get(key, zero_slot) for key in gc.output_keys]
+    return CompiledNetwork(len(gc.input_keys), node_depth, bias, response, activation,
+                           link_start, link_src, link_weight, output_slots)
+
+
+# Flat binary model file: a header of int32 counts, the activation names the
+# IDs refer to, then the CompiledNetwork arrays back to back (little-endian,
+# 8-byte aligned). Loading is one read plus zero-copy views and needs only
+# NumPy, not neat-python or the genome classes.
+MODEL_MAGIC = b"JKNET\0\0\0"
+MODEL_FORMAT_VERSION = 1
+_INT_FIELDS = ("node_depth", "activation", "link_start", "link_src", "output_slots")
+_FLOAT_FIELDS = ("bias", "response", "link_weight")
+
+def _pad8(data):
+    return data + b"\0" * (-len(data) % 8)
+
+def save_network(path, net):
+    names = "\n".join(name for name, _ in ACTIVATIONS).encode()
+    header = np.array([MODEL_FORMAT_VERSION, net.num_inputs, net.num_nodes,
+                       len(net.link_src), net.num_outputs, len(names)], dtype="<i4")
+    parts = [MODEL_MAGIC, _pad8(header.tobytes() + names)]
+    parts.append(_pad8(b"".join(getattr(net, f).astype("<i4").tobytes() for f in _INT_FIELDS)))
+    parts.extend(getattr(net, f).astype("<f8").tobytes() for f in _FLOAT_FIELDS)
+    with open(path, "wb") as f:
+        f.write(b"".join(parts))
+
+def load_network(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != MODEL_MAGIC:
+        raise ValueError(f"{path} is not a model file")
+    version, num_inputs, nodes, links, outputs, names_len = np.frombuffer(data, "<i4", 6, 8).tolist()
+    if version != MODEL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format version {version} in {path}")
+    names = data[32:32 + names_len].decode().split("\n")
+
+    offset = 32 + names_len + (-(32 + names_len) % 8)
+    arrays = {}
+    for field, count in zip(_INT_FIELDS, (nodes, nodes, nodes + 1, links, outputs)):
+        arrays[field] = np.frombuffer(data, "<i4", count, offset)
+        offset += 4 * count
+    offset += -offset % 8
+    for field, count in zip(_FLOAT_FIELDS, (nodes, nodes, links)):
+        arrays[field] = np.frombuffer(data, "<f8", count, offset)
+        offset += 8 * count
+
+    if names != [name for name, _ in ACTIVATIONS]:
+        remap = np.array([ACTIVATION_IDS[name] for name in names], dtype=np.int32)
+        arrays["activation"] = remap[arrays["activation"]]
+    return CompiledNetwork(num_inputs, **arrays)
+
+
+# Many compiled networks evaluated together. Nodes of the same depth across
+# all networks form one batch layer, with incoming links padded to the widest
+# fan-in in that layer (padding reads the zero slot with weight 0). Links are
+# summed one position at a time, in link order, which reproduces the Python
+# sum() in FeedForwardNetwork.activate.
+class BatchNetwork:
+    def __init__(self, networks):
+        self.size = len(networks)
+        self.num_inputs = networks[0].num_inputs
+        self.num_slots = self.num_inputs + 1 + max(net.num_nodes for net in networks)
+        self.output_slots = np.array([net.output_slots for net in networks], dtype=np.int32)
+
+        max_depth = max((int(net.node_depth.max()) for net in networks if net.num_nodes), default=-1)
+        self.layers = []
+        for depth in range(max_depth + 1):
+            rows, dst, links, bias, response, activation = [], [], [], [], [], []
+            for row, net in enumerate(networks):
+                for j in np.flatnonzero(net.node_depth == depth):
+                    start, end = net.link_start[j], net.link_start[j + 1]
+                    rows.append(row)
+                    dst.append(self.num_inputs + 1 + j)
+                    links.append((net.link_src[start:end], net.link_weight[start:end]))
+                    bias.append(net.bias[j])
+                    response.append(net.response[j])
+                    activation.append(net.activation[j])
+
+            width = max(len(src) for src, _ in links)
+            src = np.full((len(links), width), self.num_inputs, dtype=np.int32)
+            weight = np.zeros((len(links), width))
+            for k, (s, w) in enumerate(links):
+                src[k, :len(s)] = s
+                weight[k, :len(w)] = w
+            self.layers.append((np.array(rows), np.array(dst), src, weight, np.array(bias),
+                                np.array(response), np.array(activation)))
+
+    @classmethod
+    def from_genomes(cls, genomes, config):
+        return cls([compile_genome(genome, config) for _, genome in genomes])
+
+    # inputs is (len(rows), num_inputs); rows selects which networks to run
+    # (all by default) and the result is (len(rows), num_outputs).
+    def activate(self, inputs, rows=None):
+        if rows is None:
+            rows = np.arange(self.size)
+        values = np.zeros((self.size, self.num_slots))
+        values[rows, :self.num_inputs] = inputs
+        active = np.zeros(self.size, dtype=bool)
+        active[rows] = True
+
+        for row, dst, src, weight, bias, response, activation in self.layers:
+            keep = active[row]
+            if not keep.all():
+                row, dst, src, weight = row[keep], dst[keep], src[keep], weight[keep]
+                bias, response, activation = bias[keep], response[keep], activation[keep]
+
+            s = np.zeros(len(row))
+            for k in range(src.shape[1]):
+                s += values[row, src[:, k]] * weight[:, k]
+            z = bias + response * s
+
+            out = np.empty_like(z)
+            for act in np.unique(activation):
+                sel = activation == act
+                out[sel] = ACTIVATIONS[act][1](z[sel])
+            values[row, dst] = out
+
+        return values[rows[:, None], self.output_slots[rows]]
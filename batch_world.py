@@ -0,0 +1,110 @@
+import numpy as np
+import pygame
+from platform_model import PlatformIndex
+from player import Player
+
+MAX_FALL_SPEED = 15   # Player.apply_gravity cap
+LAND_TOLERANCE = 10   # Player.check_collision: feet may sink this far and still land
+
+
+# Whole-population version of Player physics. Positions, velocities and flags
+# live in NumPy arrays indexed by agent, and every step works on an array of
+# live agent indexes, so dead agents are masked out instead of popped.
+class BatchWorld:
+    # start_x / start_y are one position for everyone or one per agent
+    def __init__(self, platforms, n, start_x, start_y, index=None, swept=True):
+        proto = Player(0, 0)
+        self.width, self.height = proto.width, proto.height
+        self.fixed_power = proto.fixed_power
+        self.swept = swept
+
+        self.platforms = platforms
+        self.index = index or PlatformIndex(platforms)
+        self.plat_x = np.array([p.x for p in platforms], dtype=float)
+        self.plat_y = np.array([p.y for p in platforms], dtype=float)
+        self.plat_w = np.array([p.width for p in platforms], dtype=float)
+        self.plat_h = np.array([p.height for p in platforms], dtype=float)
+        self.plat_type = np.array([p.type for p in platforms])
+
+        self.x = np.broadcast_to(np.asarray(start_x, dtype=float), (n,)).copy()
+        self.y = np.broadcast_to(np.asarray(start_y, dtype=float), (n,)).copy()
+        self.prev_y = self.y.copy()
+        self.vel_x = np.zeros(n)
+        self.vel_y = np.zeros(n)
+        self.on_ground = np.zeros(n, dtype=bool)
+        self.alive = np.ones(n, dtype=bool)
+        self.sprite = None
+
+    def live(self):
+        return np.flatnonzero(self.alive)
+
+    def kill(self, ids):
+        self.alive[ids] = False
+
+    def apply_gravity(self, g, ids):
+        self.vel_y[ids] = np.minimum(self.vel_y[ids] + g, MAX_FALL_SPEED)
+
+    def update(self, ids):
+        self.prev_y[ids] = self.y[ids]
+        self.x[ids] += self.vel_x[ids]
+        self.y[ids] += self.vel_y[ids]
+
+    def jump(self, ids, dx, dy):
+        dist = np.hypot(dx, dy)
+        moving = dist != 0
+        ids, dx, dy, dist = ids[moving], dx[moving], dy[moving], dist[moving]
+        self.vel_x[ids] = dx / dist * self.fixed_power
+        self.vel_y[ids] = dy / dist * self.fixed_power
+        self.on_ground[ids] = False
+
+    # Player.get_nearest_platform_x / _y for every agent in ids
+    def nearest_platform(self, ids):
+        return self.index.nearest_visible_batch(self.x[ids], self.y[ids])
+
+    # Player.check_collision against the broad-phase candidates of every
+    # agent, followed by land_on. Platforms are tested in list order and the
+    # first landing wins, so returns (index of the landed platform or -1,
+    # slides before it).
+    def collide(self, ids):
+        x = self.x[ids][:, None]
+        y = self.y[ids][:, None]
+        vel_y = self.vel_y[ids][:, None]
+        w, h = self.width, self.height
+        feet = (self.prev_y[ids][:, None] if self.swept else y) + h
+
+        cand, valid = self.index.collision_candidates_batch(x[:, 0], w)
+        px, py = self.plat_x[cand], self.plat_y[cand]
+        over_x = valid & (x + w > px) & (x < px + self.plat_w[cand])
+        land = over_x & (vel_y > 0) & (y + h > py) & (feet <= py + LAND_TOLERANCE)
+        overlap = over_x & (y + h > py) & (y < py + self.plat_h[cand])
+
+        n = len(self.platforms)
+        first = np.where(land, cand, n).min(axis=1)
+        has_land = first < n
+        slides = (overlap & ~land & (cand < first[:, None])).sum(axis=1)
+        first = np.where(has_land, first, -1)
+
+        landed = ids[has_land]
+        self.y[landed] = self.plat_y[first[has_land]] - h
+        self.vel_x[landed] = 0
+        self.vel_y[landed] = 0
+        self.on_ground[landed] = True
+        return first, slides
+
+    def out_of_bounds(self, ids, width, height):
+        x, y = self.x[ids], self.y[ids]
+        return (y > height + 50) | (x < -50) | (x > width + 50)
+
+    # prev: positions before the latest tick, drawn alpha of the way to the
+    # current ones (render interpolation). All agents go out in one blits()
+    # call of a shared sprite. Returns the rects drawn.
+    def draw(self, win, prev=None, alpha=1.0):
+        if self.sprite is None:
+            self.sprite = pygame.Surface((self.width, self.height))
+            self.sprite.fill((0, 0, 255))
+        ids = self.live()
+        x, y = self.x[ids], self.y[ids]
+        if prev is not None:
+            x = prev[0][ids] + (x - prev[0][ids]) * alpha
+            y = prev[1][ids] + (y - prev[1][ids]) * alpha
+        return win.blits([(self.sprite, pos) for pos in zip(x.tolist(), y.tolist())])
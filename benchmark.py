@@ -0,0 +1,231 @@
+import argparse
+import glob
+import importlib.metadata
+import json
+import os
+import pickle
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import neat
+import numpy as np
+from batch_network import BatchNetwork, load_network
+from batch_world import BatchWorld
+from level import get_fixed_level
+from platform_model import Platform, PlatformIndex
+from player import Player
+import train_agent
+
+SEED = 1234
+MIN_TIME = 0.5                 # seconds each rate measurement runs for
+PLATFORM_COUNTS = [8, 64, 512, 4096]
+POP_SIZES = [50, 150, 1000, 10000]
+QUERY_AGENTS = 1000            # agents per batched query / BatchWorld step
+
+# Calls fn until at least min_time has passed and returns calls per second
+def rate(fn, min_time=MIN_TIME):
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+def random_platforms(n, rng, width=1400, height=600):
+    # n pads spread over a level that grows with n, so density stays the same
+    span = width * max(1, n // 8)
+    platforms = [Platform(0, height - 40, 100, 20, "start")]
+    for _ in range(n - 2):
+        platforms.append(Platform(rng.uniform(100, span - 200), rng.uniform(height / 4, height - 100),
+                                  100, 20, "pad"))
+    platforms.append(Platform(span - 100, height - 40, 100, 20, "end"))
+    return platforms
+
+
+def bench_physics(min_time=MIN_TIME):
+    player = Player(10, 100)
+
+    def step():
+        player.apply_gravity(train_agent.GRAVITY)
+        player.update()
+        if player.y > 500:
+            player.y = player.prev_y = 100
+            player.vel_y = 0
+
+    world = BatchWorld(get_fixed_level(), QUERY_AGENTS, 10, 100)
+    ids = world.live()
+
+    def batch_step():
+        world.apply_gravity(train_agent.GRAVITY, ids)
+        world.update(ids)
+        world.y[world.y > 500] = 100
+
+    return {
+        "player_steps_per_sec": rate(step, min_time),
+        "batch_world_agent_steps_per_sec": rate(batch_step, min_time) * QUERY_AGENTS,
+    }
+
+def bench_queries(counts=PLATFORM_COUNTS, min_time=MIN_TIME):
+    results = []
+    for count in counts:
+        rng = random.Random(SEED + count)
+        platforms = random_platforms(count, rng)
+        index = PlatformIndex(platforms)
+        span = max(p.x + p.width for p in platforms)
+        players = []
+        for _ in range(256):
+            player = Player(rng.uniform(0, span), rng.uniform(0, 560))
+            player.prev_y = player.y - 5
+            player.vel_y = 5
+            players.append(player)
+        xs = np.array([rng.uniform(0, span) for _ in range(QUERY_AGENTS)])
+        ys = np.array([rng.uniform(0, 560) for _ in range(QUERY_AGENTS)])
+
+        def collide_scan():
+            for player in players:
+                for plat in platforms:
+                    player.check_collision(plat)
+
+        def collide_index():
+            for player in players:
+                for k in index.collision_candidates(player.x, player.width):
+                    player.check_collision(platforms[k])
+
+        def nearest_scan():
+            for player in players:
+                player.get_nearest_platform_x(platforms)
+                player.get_nearest_platform_y(platforms)
+
+        def nearest_index():
+            for player in players:
+                player.get_nearest_platform(index)
+
+        scan = rate(collide_scan, min_time)
+        results.append({
+            "platforms": count,
+            "check_collision_per_sec": scan * len(players) * count,
+            "collision_scan_agents_per_sec": scan * len(players),
+            "collision_index_agents_per_sec": rate(collide_index, min_time) * len(players),
+            "nearest_scan_per_sec": rate(nearest_scan, min_time) * len(players),
+            "nearest_index_per_sec": rate(nearest_index, min_time) * len(players),
+            "nearest_batch_per_sec": rate(lambda: index.nearest_visible_batch(xs, ys), min_time) * QUERY_AGENTS,
+        })
+    return results
+
+def bench_activate(config, models_dir="models", min_time=MIN_TIME):
+    rng = np.random.default_rng(SEED)
+    inputs = rng.uniform(-1, 1, (QUERY_AGENTS, len(config.genome_config.input_keys)))
+    results = []
+    for path in sorted(glob.glob(os.path.join(models_dir, "*.pkl"))):
+        with open(path, "rb") as f:
+            genome = pickle.load(f)
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        rows = [list(row) for row in inputs[:64]]
+        entry = {
+            "model": os.path.basename(path),
+            "feed_forward_per_sec": rate(lambda: [net.activate(row) for row in rows], min_time) * len(rows),
+        }
+        bin_path = os.path.splitext(path)[0] + ".bin"
+        if os.path.exists(bin_path):
+            batch = BatchNetwork([load_network(bin_path)] * QUERY_AGENTS)
+            entry["batch_network_per_sec"] = rate(lambda: batch.activate(inputs), min_time) * QUERY_AGENTS
+            entry["load_network_per_sec"] = rate(lambda: load_network(bin_path), min_time)
+        results.append(entry)
+    return results
+
+# Whole generations through train_agent.eval_genomes on fresh, seeded
+# populations. Runs in a scratch directory so a finisher's best_genome.pkl
+# does not overwrite the real one.
+def bench_generations(config, pop_sizes=POP_SIZES, generations=1):
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            for pop_size in pop_sizes:
+                random.seed(SEED)
+                config.pop_size = pop_size
+                population = neat.Population(config)
+                genomes = list(population.population.items())
+                start = time.perf_counter()
+                for _ in range(generations):
+                    train_agent.eval_genomes(genomes, config)
+                elapsed = time.perf_counter() - start
+                results.append({
+                    "pop_size": pop_size,
+                    "generations": generations,
+                    "seconds": elapsed,
+                    "generations_per_sec": generations / elapsed,
+                    "best_fitness": max(g.fitness for _, g in genomes),
+                })
+            train_agent.get_writer().flush()
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def environment(min_time=MIN_TIME):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "neat_python": importlib.metadata.version("neat-python"),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "seed": SEED,
+        "min_time": min_time,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless, seeded throughput benchmarks")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--pops", help="comma-separated population sizes for the eval_genomes "
+                                       "benchmark (default: " + ",".join(map(str, POP_SIZES)) + ")")
+    parser.add_argument("--generations", type=int, default=1)
+    parser.add_argument("--quick", action="store_true",
+                        help="shorter measurements and only the smaller populations")
+    args = parser.parse_args()
+
+    pop_sizes = POP_SIZES
+    min_time = MIN_TIME
+    if args.quick:
+        min_time = 0.1
+        pop_sizes = [50, 150]
+    if args.pops:
+        pop_sizes = [int(n) for n in args.pops.split(",")]
+
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    config = neat.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        os.path.join(local_dir, "config-feedforward.ini"),
+    )
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+    report = {"environment": environment(min_time)}
+    print("Physics...")
+    report["physics"] = bench_physics(min_time)
+    print("Collision and nearest-platform queries...")
+    report["queries"] = bench_queries(min_time=min_time)
+    print("Network activation...")
+    report["activate"] = bench_activate(config, os.path.join(local_dir, "models"), min_time)
+    print("Generations...")
+    report["generations"] = bench_generations(config, pop_sizes, args.generations)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Benchmark results written to {args.output}")
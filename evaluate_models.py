@@ -0,0 +1,170 @@
+import argparse
+import glob
+import hashlib
+import multiprocessing
+import os
+import pickle
+import time
+import numpy as np
+import pandas as pd
+import train_agent
+from batch_network import BatchNetwork, compile_genome, load_network
+from fitness_cache import FitnessCache, network_digest
+from level import LevelSet, array_to_level, get_fixed_level, load_level_set
+from play import parse_seeds
+from player import Player
+
+LEVEL_SEEDS = range(100)
+STARTS = 5                      # start positions per level, spread over the start platform
+EVAL_CACHE_PATH = "eval-cache"
+EVAL_CACHE_ENTRIES = 1000
+EVAL_DIR = "evaluations"
+
+
+# A saved model as (name, CompiledNetwork): models/foo.bin, or a pickled
+# genome compiled with the training config
+def load_model(path, config_file):
+    if path.endswith(".bin"):
+        return os.path.basename(path), load_network(path)
+    import neat
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation, config_file)
+    with open(path, "rb") as f:
+        return os.path.basename(path), compile_genome(pickle.load(f), config)
+
+# `count` start spots along the start platform, from its left edge to where
+# the agent's right side meets its right edge; a single start is the
+# trainer's usual spot
+def start_positions(platforms, count):
+    start = next(p for p in platforms if p.type == "start")
+    height = Player(0, 0).height
+    if count == 1:
+        return np.array([start.x + 10]), np.array([start.y - height])
+    xs = np.linspace(start.x, start.x + start.width - Player(0, 0).width, count)
+    return xs, np.full(count, start.y - height)
+
+
+# One level in a worker: every model from every start position as one batch
+# of independent agents. Returns (fitness, finish tick or 0), each shaped
+# (models, starts).
+def evaluate_level(job):
+    networks, platforms, starts = job
+    platforms = array_to_level(platforms)
+    xs, ys = start_positions(platforms, starts)
+    n = len(networks) * starts
+    nets = BatchNetwork([net for net in networks for _ in range(starts)])
+    finish_ticks = np.zeros(n, dtype=np.int64)
+    fitness, _ = train_agent.simulate([(k, None) for k in range(n)], None, platforms=platforms,
+                                      nets=nets, independent=True,
+                                      start=(np.tile(xs, len(networks)), np.tile(ys, len(networks))),
+                                      finish_ticks=finish_ticks)
+    shape = (len(networks), starts)
+    return np.reshape(fitness, shape), finish_ticks.reshape(shape)
+
+# What an episode's result depends on besides the network: the trainer's
+# scoring (train_agent.cache_context) and the start positions
+def eval_context(levels, starts):
+    return hashlib.sha1(f"{train_agent.cache_context(levels)}:{starts}".encode()).hexdigest()
+
+
+# Scores every model on every level and start position and returns one row
+# per episode. Results are cached per (network digest, level set, starts), so
+# only models not seen before with these levels are simulated, with the
+# levels spread over `workers` processes.
+def evaluate_models(models, levels, starts=STARTS, workers=None, cache=None):
+    context = eval_context(levels, starts)
+    keys = [context + network_digest(net) for _, net in models]
+    results = [cache.get(key) if cache is not None else None for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+
+    if missing:
+        networks = [models[i][1] for i in missing]
+        jobs = [(networks, levels.platforms[k, :levels.counts[k]], starts) for k in range(len(levels))]
+        workers = min(workers or os.cpu_count(), len(jobs))
+        if workers > 1:
+            with multiprocessing.Pool(workers) as pool:
+                per_level = pool.map(evaluate_level, jobs)
+        else:
+            per_level = [evaluate_level(job) for job in jobs]
+        fitness = np.stack([f for f, _ in per_level], axis=1)      # (models, levels, starts)
+        ticks = np.stack([t for _, t in per_level], axis=1)
+        for k, i in enumerate(missing):
+            results[i] = {"fitness": fitness[k], "finish_tick": ticks[k]}
+            if cache is not None:
+                cache.put(keys[i], results[i])
+
+    seeds = levels.seeds if levels.seeds is not None else np.arange(len(levels))
+    tables = []
+    for (name, _), result in zip(models, results):
+        level, start = np.meshgrid(np.arange(len(levels)), np.arange(starts), indexing="ij")
+        tick = result["finish_tick"].ravel()
+        tables.append(pd.DataFrame({
+            "model": name,
+            "level": np.asarray(seeds)[level.ravel()],
+            "start": start.ravel(),
+            "fitness": result["fitness"].ravel(),
+            "finished": tick > 0,
+            "time_to_goal": np.where(tick > 0, tick / train_agent.FPS, np.nan),
+        }))
+    return pd.concat(tables, ignore_index=True), len(missing)
+
+# Per model: success rate, time-to-goal (seconds, finished episodes only)
+# and fitness distribution
+def summarize(episodes):
+    grouped = episodes.groupby("model", sort=False)
+    summary = pd.DataFrame({
+        "episodes": grouped.size(),
+        "success_rate": grouped["finished"].mean(),
+        "time_to_goal_mean": grouped["time_to_goal"].mean(),
+        "time_to_goal_median": grouped["time_to_goal"].median(),
+        "time_to_goal_p90": grouped["time_to_goal"].quantile(0.9),
+        "fitness_mean": grouped["fitness"].mean(),
+        "fitness_std": grouped["fitness"].std(),
+        "fitness_min": grouped["fitness"].min(),
+        "fitness_p10": grouped["fitness"].quantile(0.1),
+        "fitness_median": grouped["fitness"].median(),
+        "fitness_p90": grouped["fitness"].quantile(0.9),
+        "fitness_max": grouped["fitness"].max(),
+    })
+    return summary.sort_values(["success_rate", "fitness_mean"], ascending=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare saved models over many levels and start positions")
+    parser.add_argument("models", nargs="*", help="model files (default: models/*.pkl)")
+    parser.add_argument("--seeds", help="generated level seeds, e.g. 0-499 (default: 0-99); "
+                                        "'fixed' for the hand-made level")
+    parser.add_argument("--starts", type=int, default=STARTS, help="start positions per level")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-cache", action="store_true", help=f"do not read or write {EVAL_CACHE_PATH}")
+    parser.add_argument("--out", default=os.path.join(EVAL_DIR, time.strftime("eval-%Y%m%d-%H%M%S")))
+    args = parser.parse_args()
+
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    config_file = os.path.join(local_dir, "config-feedforward.ini")
+    paths = args.models or sorted(glob.glob(os.path.join(local_dir, "models", "*.pkl")))
+    models = [load_model(path, config_file) for path in paths]
+
+    if args.seeds == "fixed":
+        levels = LevelSet.from_levels([get_fixed_level(train_agent.HEIGHT)])
+    else:
+        levels = load_level_set(parse_seeds(args.seeds) if args.seeds else LEVEL_SEEDS,
+                                width=train_agent.WIDTH, height=train_agent.HEIGHT,
+                                gravity=train_agent.GRAVITY)
+
+    cache = None if args.no_cache else FitnessCache(EVAL_CACHE_ENTRIES, EVAL_CACHE_PATH)
+    start = time.perf_counter()
+    try:
+        episodes, simulated = evaluate_models(models, levels, args.starts, args.workers, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(episodes)
+    os.makedirs(args.out, exist_ok=True)
+    episodes.to_csv(os.path.join(args.out, "episodes.csv"), index=False)
+    summary.to_csv(os.path.join(args.out, "summary.csv"))
+    print(summary.to_string(float_format=lambda v: f"{v:.2f}"))
+    print(f"✅ {len(models)} models x {len(levels)} levels x {args.starts} starts in {elapsed:.1f} s "
+          f"({simulated} simulated, {len(models) - simulated} cached) -> {args.out}")
@@ -0,0 +1,26 @@
+import glob
+import os
+import pickle
+import neat
+from batch_network import compile_genome, save_network
+
+# Converts pickled genomes into the flat binary model format that play-time
+# code loads without neat-python: models/foo.pkl -> models/foo.bin
+def export_model(genome_path, config, output_path=None):
+    with open(genome_path, "rb") as f:
+        genome = pickle.load(f)
+    output_path = output_path or os.path.splitext(genome_path)[0] + ".bin"
+    save_network(output_path, compile_genome(genome, config))
+    return output_path
+
+if __name__ == "__main__":
+    local_dir = os.path.dirname(__file__)
+    config = neat.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        os.path.join(local_dir, "config-feedforward.ini"),
+    )
+    for path in sorted(glob.glob(os.path.join(local_dir, "models", "*.pkl"))):
+        print(f"✅ Exported {path} -> {export_model(path, config)}")
@@ -0,0 +1,66 @@
+import hashlib
+import shelve
+from collections import OrderedDict
+
+
+# Canonical digest of a genome's phenotype: the compiled network's arrays
+# (evaluation order, link order, weights, biases, activations). Disabled
+# connections, unreachable nodes and node numbering do not change it, and
+# two genomes with the same digest compile to the same arrays, so they score
+# the same.
+def network_digest(net):
+    h = hashlib.sha1()
+    h.update(str(net.num_inputs).encode())
+    for field in ("node_depth", "bias", "response", "activation",
+                  "link_start", "link_src", "link_weight", "output_slots"):
+        h.update(field.encode())
+        h.update(getattr(net, field).tobytes())
+    return h.hexdigest()
+
+
+# Bounded in-memory LRU of key -> value. With a path, entries evicted from
+# memory spill to a shelve database there and are looked up again on a miss,
+# and close() writes everything out, so a later run with the same evaluator
+# starts warm. The database is not safe to share between running processes.
+class FitnessCache:
+    def __init__(self, max_entries=10000, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.disk = shelve.open(path) if path else None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        if self.disk is not None and key in self.disk:
+            value = self.disk[key]
+            self._store(key, value)
+            self.hits += 1
+            return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._store(key, value)
+
+    def _store(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            old_key, old_value = self.entries.popitem(last=False)
+            if self.disk is not None:
+                self.disk[old_key] = old_value
+
+    def close(self):
+        if self.disk is not None:
+            for key, value in self.entries.items():
+                self.disk[key] = value
+            self.disk.close()
+            self.disk = None
@@ -0,0 +1,79 @@
+import math
+import time
+from level import GRAVITY
+
+TICK_RATE = 60             # physics ticks per second; GRAVITY and speeds are per tick
+DISPLAY_FPS = 120          # frame cap when drawing; physics stays at TICK_RATE
+MAX_TICKS_PER_FRAME = 5    # catch-up limit after a stall, so a slow frame slows the game
+
+
+# Fixed-timestep clock with an accumulator. Real time since the last call is
+# banked and paid out in whole ticks, so the simulation runs at TICK_RATE
+# whatever the frame rate, and alpha says how far the display is between the
+# last two ticks for interpolated drawing. Loops that run one tick per
+# iteration call wait(frame) before each tick: it draws frames at display
+# rate until the next tick is due.
+class FixedStep:
+    def __init__(self, tick_rate=TICK_RATE, display_fps=DISPLAY_FPS,
+                 max_ticks=MAX_TICKS_PER_FRAME, now=time.perf_counter):
+        self.tick_time = 1.0 / tick_rate
+        self.frame_time = 1.0 / display_fps if display_fps else 0.0
+        self.max_ticks = max_ticks
+        self.now = now
+        self.last = None
+        self.accumulator = 0.0
+        self.due = 0
+
+    # Ticks to simulate for the real time elapsed since the last call
+    def advance(self):
+        now = self.now()
+        if self.last is not None:
+            self.accumulator += min(now - self.last, self.max_ticks * self.tick_time)
+        self.last = now
+        ticks = int(self.accumulator / self.tick_time)
+        self.accumulator -= ticks * self.tick_time
+        return ticks
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.tick_time
+
+    def wait(self, frame):
+        while self.due == 0:
+            start = self.now()
+            frame(self.alpha)
+            rest = self.frame_time - (self.now() - start)
+            if rest > 0:
+                time.sleep(rest)
+            self.due = self.advance()
+        self.due -= 1
+
+def lerp(a, b, alpha):
+    return a + (b - a) * alpha
+
+
+# One physics tick for a single Player, in the trainer's order (see
+# train_agent.simulate): gravity and movement, then decide(player) may return
+# a jump direction (dx, dy), applied if the player stood on a platform at the
+# end of the last tick, then collisions, where the first platform landed on
+# in list order wins. Slides do not change the player's motion. Returns the
+# index of the platform landed on, or None.
+def step_player(player, platforms, index, decide):
+    player.apply_gravity(GRAVITY)
+    player.update()
+
+    direction = decide(player)
+    if player.on_ground and direction is not None:
+        player.jump(*direction)
+    player.on_ground = False
+
+    for k in index.collision_candidates(player.x, player.width):
+        if player.check_collision(platforms[k]) == "land":
+            player.land_on(platforms[k])
+            return k
+    return None
+
+# The trainer's jump for a network output angle in degrees
+def aim(player, angle):
+    rad = math.radians(angle)
+    return player.fixed_power * math.cos(rad), player.fixed_power * math.sin(rad)
@@ -0,0 +1,148 @@
+import argparse
+import contextlib
+import glob
+import multiprocessing
+import os
+import pickle
+import queue
+import random
+import time
+import numpy as np
+from neat.reporting import BaseReporter
+import train_agent
+from metrics_reporter import load_run
+
+ISLANDS = 4
+MIGRATION_INTERVAL = 5      # generations between migrations
+MIGRANTS = 2                # best genomes each island sends per migration
+MIGRATION_TIMEOUT = 600     # seconds to wait for a neighbour before going on
+ISLANDS_DIR = "islands"
+
+
+# Ring migration between island populations. Every MIGRATION_INTERVAL
+# generations an island sends copies of its best genomes to the next island
+# right after evaluation, then, once it has bred its next generation, waits
+# for the previous island's migrants and puts them in place of its newest
+# offspring (re-keyed so keys stay unique) before re-speciating. All islands
+# migrate at the same generations, so each exchange is one message per link.
+class MigrationReporter(BaseReporter):
+    def __init__(self, population, inbox, outbox, interval=MIGRATION_INTERVAL,
+                 migrants=MIGRANTS, timeout=MIGRATION_TIMEOUT):
+        self.population = population
+        self.inbox = inbox
+        self.outbox = outbox
+        self.interval = interval
+        self.migrants = migrants
+        self.timeout = timeout
+        self.generation = None
+
+    def _due(self):
+        return self.outbox is not None and (self.generation + 1) % self.interval == 0
+
+    def start_generation(self, generation):
+        self.generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        if self._due():
+            best = sorted(population.values(), key=lambda g: g.fitness, reverse=True)
+            self.outbox.put(best[:self.migrants])
+
+    def end_generation(self, config, population, species_set):
+        if not self._due():
+            return
+        try:
+            migrants = self.inbox.get(timeout=self.timeout)
+        except queue.Empty:
+            print("No migrants arrived; continuing without them")
+            return
+
+        indexer = self.population.reproduction.genome_indexer
+        for key, genome in zip(list(population)[-len(migrants):], migrants):
+            del population[key]
+            genome.key = next(indexer)
+            population[genome.key] = genome
+        print(f"Received {len(migrants)} migrants")
+        species_set.speciate(config, population, self.generation)
+
+    # Saved in checkpoints with the other reporters; the queues are not, so a
+    # population restored from an island's checkpoint evolves on its own
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["population"] = state["inbox"] = state["outbox"] = None
+        return state
+
+
+# One island: a full train_agent run in its own directory (log, metrics,
+# checkpoints, best genome) with a MigrationReporter in front of the others
+def run_island(index, config_file, inbox, outbox, results, generations, seed, island_dir,
+               interval, migrants):
+    os.makedirs(island_dir, exist_ok=True)
+    os.chdir(island_dir)
+    with open("logs.txt", "w") as log, contextlib.redirect_stdout(log):
+        random.seed(seed)
+        np.random.seed(seed)
+        train_agent.WORKERS = 1  # the islands are the parallelism
+        p = train_agent.create_population(config_file)
+        p.reporters.reporters.insert(0, MigrationReporter(p, inbox, outbox, interval, migrants))
+        winner = train_agent.train(p, generations)
+    results.put((index, winner))
+
+def run_islands(config_file, islands=ISLANDS, generations=train_agent.GENERATION_TO_RUN,
+                seed=0, out_dir=ISLANDS_DIR, interval=MIGRATION_INTERVAL, migrants=MIGRANTS):
+    config_file = os.path.abspath(config_file)
+    out_dir = os.path.abspath(out_dir)
+    inboxes = [multiprocessing.Queue() for _ in range(islands)]
+    results = multiprocessing.Queue()
+    processes = []
+    for k in range(islands):
+        outbox = inboxes[(k + 1) % islands] if islands > 1 else None
+        processes.append(multiprocessing.Process(
+            target=run_island, name=f"island-{k}",
+            args=(k, config_file, inboxes[k], outbox, results, generations, seed + k,
+                  os.path.join(out_dir, f"island-{k}"), interval, migrants)))
+    for process in processes:
+        process.start()
+
+    winners = {}
+    while len(winners) < islands:
+        try:
+            index, winner = results.get(timeout=5)
+            winners[index] = winner
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                break
+    for process in processes:
+        process.join()
+    if not winners:
+        raise RuntimeError("Every island failed; see islands/island-*/logs.txt")
+
+    best = max(winners.values(), key=lambda g: g.fitness)
+    with open(os.path.join(out_dir, "best_genome.pkl"), "wb") as f:
+        pickle.dump(best, f)
+
+    for k in range(islands):
+        runs = glob.glob(os.path.join(out_dir, f"island-{k}", train_agent.RUNS_DIR, "*"))
+        if k not in winners or not runs:
+            print(f"island {k}: failed, see its logs.txt")
+            continue
+        stats, _ = load_run(runs[0])
+        print(f"island {k}: best fitness {stats['best_fitness'].max():.2f}, "
+              f"final genetic distance {stats['mean_genetic_distance'].iloc[-1]:.3f}, "
+              f"{stats['num_species'].iloc[-1]} species")
+    print(f"✅ Best genome (fitness {best.fitness:.2f}) saved to {out_dir}/best_genome.pkl")
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Island-model NEAT: one population per process with ring migration")
+    parser.add_argument("--islands", type=int, default=ISLANDS)
+    parser.add_argument("--generations", type=int, default=train_agent.GENERATION_TO_RUN)
+    parser.add_argument("--interval", type=int, default=MIGRATION_INTERVAL)
+    parser.add_argument("--migrants", type=int, default=MIGRANTS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=os.path.join(ISLANDS_DIR, time.strftime("islands-%Y%m%d-%H%M%S")))
+    args = parser.parse_args()
+
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    run_islands(os.path.join(local_dir, "config-feedforward.ini"), args.islands,
+                args.generations, args.seed, args.out, args.interval, args.migrants)
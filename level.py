@@ -0,0 +1,170 @@
+import hashlib
+import os
+import random
+import numpy as np
+from batch_world import LAND_TOLERANCE, MAX_FALL_SPEED, BatchWorld
+from platform_model import Platform
+from player import Player
+
+WIDTH, HEIGHT = 1400, 600
+GRAVITY = 0.4
+PLATFORM_TYPES = ["start", "pad", "end"]
+LEVEL_CACHE_DIR = "levels"
+LEVEL_GENERATOR_VERSION = 1  # bump when generate_level() or reachable() changes the levels a seed gives
+
+def get_fixed_level(height=HEIGHT):
+    platforms = []
+    ground_y = height - 40
+    # Start platform (left ground)
+    platforms.append(Platform(0, ground_y, 100, 20, "start"))
+
+    # Intermediate pads, smooth ascending jumps
+    pads = [
+        (180, height - 140),
+        (350, height - 200),
+        (520, height - 260),
+        (700, height - 230),
+        (880, height - 280),
+        (1050, height - 200),
+    ]
+    for x, y in pads:
+        platforms.append(Platform(x, y, 100, 20, "pad"))
+
+    # End platform at ground level, right of last pad
+    end_x = pads[-1][0] + 240
+    platforms.append(Platform(end_x, ground_y, 100, 20, "end"))
+    return platforms
+
+# Where agents are spawned: standing on the start platform
+def start_position(platforms):
+    start = next(p for p in platforms if p.type == "start")
+    return start.x + 10, start.y - Player(0, 0).height
+
+# Can an agent standing on src land on dst with one jump? Tries every whole
+# degree of upward jump from both ends and the middle of src, with the same
+# tick order and physics as the trainer, and checks the first platform hit.
+def reachable(platforms, src, dst, gravity=GRAVITY, max_ticks=600):
+    angles = np.radians(np.arange(-179.0, 0.0))
+    proto = Player(0, 0)
+    starts = [src.x, src.x + (src.width - proto.width) / 2, src.x + src.width - proto.width]
+    n = len(starts) * len(angles)
+    world = BatchWorld(platforms, n, 0, src.y - proto.height)
+    world.x[:] = np.repeat(starts, len(angles))
+    angle = np.tile(angles, len(starts))
+    target = platforms.index(dst)
+    bottom = max(p.y + p.height for p in platforms)
+
+    ids = world.live()
+    world.apply_gravity(gravity, ids)
+    world.update(ids)
+    world.jump(ids, world.fixed_power * np.cos(angle), world.fixed_power * np.sin(angle))
+    world.collide(ids)
+    for _ in range(max_ticks):
+        ids = world.live()
+        if len(ids) == 0:
+            return False
+        world.apply_gravity(gravity, ids)
+        world.update(ids)
+        world.on_ground[ids] = False
+        plat, _ = world.collide(ids)
+        if (plat == target).any():
+            return True
+        world.kill(ids[(plat >= 0) | (world.y[ids] > bottom + 50)])
+    return False
+
+# Seeded random level: a start platform, num_pads pads and an end platform,
+# spread across width. Every platform is placed only if the previous one can
+# reach it with a single jump of Player.fixed_power under gravity.
+def generate_level(seed, num_pads=6, width=WIDTH, height=HEIGHT, gravity=GRAVITY, attempts=50):
+    rng = random.Random(seed)
+    ground_y = height - 40
+    platforms = [Platform(0, ground_y, 100, 20, "start")]
+    step = (width - 200) / (num_pads + 1)
+
+    for k in range(num_pads + 1):
+        prev = platforms[-1]
+        kind = "end" if k == num_pads else "pad"
+        for attempt in range(attempts):
+            # Later attempts shrink towards a short, level hop
+            spread = 1 - attempt / attempts
+            x = prev.x + int(step * rng.uniform(1 - 0.3 * spread, 1 + 0.3 * spread))
+            if kind == "end":
+                y = ground_y
+            else:
+                y = prev.y + int(rng.uniform(-100, 60) * spread)
+                y = min(max(y, height // 4), height - 100)
+            x = min(x, width - 100)
+            cand = Platform(x, y, 100, 20, kind)
+            if x > prev.x and reachable(platforms + [cand], prev, cand, gravity):
+                platforms.append(cand)
+                break
+        else:
+            raise ValueError(f"Could not place platform {k + 1} of level seed {seed}")
+    return platforms
+
+def level_to_array(platforms):
+    return np.array([(p.x, p.y, p.width, p.height, PLATFORM_TYPES.index(p.type))
+                     for p in platforms], dtype=np.float32)
+
+def array_to_level(rows):
+    return [Platform(float(x), float(y), float(w), float(h), PLATFORM_TYPES[int(t)])
+            for x, y, w, h, t in rows]
+
+
+# A batch of levels stored as one padded (levels, platforms, 5) array of
+# x, y, width, height, type id, plus the platform count of each level.
+class LevelSet:
+    def __init__(self, platforms, counts, seeds=None):
+        self.platforms = platforms
+        self.counts = counts
+        self.seeds = seeds
+
+    @classmethod
+    def from_levels(cls, levels, seeds=None):
+        size = max(len(level) for level in levels)
+        platforms = np.zeros((len(levels), size, 5), dtype=np.float32)
+        for i, level in enumerate(levels):
+            platforms[i, :len(level)] = level_to_array(level)
+        counts = np.array([len(level) for level in levels], dtype=np.int32)
+        return cls(platforms, counts, None if seeds is None else np.asarray(seeds))
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __getitem__(self, i):
+        return array_to_level(self.platforms[i, :self.counts[i]])
+
+    def levels(self):
+        return [self[i] for i in range(len(self))]
+
+    def save(self, path):
+        np.savez(path, platforms=self.platforms, counts=self.counts,
+                 seeds=np.array([]) if self.seeds is None else self.seeds)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            seeds = data["seeds"] if len(data["seeds"]) else None
+            return cls(data["platforms"], data["counts"], seeds)
+
+# Everything besides the seed and settings that decides a generated level:
+# the generator's version, its defaults and the jump physics reachable() runs
+def generator_context():
+    proto = Player(0, 0)
+    return (LEVEL_GENERATOR_VERSION, WIDTH, HEIGHT, GRAVITY, proto.width, proto.height,
+            proto.fixed_power, MAX_FALL_SPEED, LAND_TOLERANCE)
+
+# generate_level for every seed, read from / written to a cache file keyed by
+# the seeds, generator settings and generator_context(), so a level set is
+# only generated once
+def load_level_set(seeds, cache_dir=LEVEL_CACHE_DIR, **params):
+    seeds = list(seeds)
+    key = hashlib.sha1(repr((generator_context(), seeds, sorted(params.items()))).encode()).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"levels-{key}.npz")
+    if os.path.exists(path):
+        return LevelSet.load(path)
+
+    levels = LevelSet.from_levels([generate_level(seed, **params) for seed in seeds], seeds)
+    os.makedirs(cache_dir, exist_ok=True)
+    levels.save(path)
+    return levels
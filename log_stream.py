@@ -0,0 +1,166 @@
+import csv
+import os
+import re
+import sys
+import time
+
+GENERATION_FIELDS = ['generation', 'avg_fitness', 'stdev_fitness', 'best_fitness',
+                     'avg_adjusted_fitness', 'mean_genetic_distance', 'std_genetic_distance', 'gen_time']
+SPECIES_FIELDS = ['generation', 'id', 'age', 'size', 'fitness', 'adj_fit', 'stag']
+
+GEN_RE = re.compile(r"\*\*\*\*\*\* Running generation (\d+) \*\*\*\*\*\*")
+AVG_RE = re.compile(r"Population's average fitness:\s*([\d\.\-]+)\s*stdev:\s*([\d\.\-]+)")
+BEST_RE = re.compile(r"Best fitness:\s*([\d\.\-]+)")
+DIST_RE = re.compile(r"Mean genetic distance\s*([\d\.\-]+),\s*standard deviation\s*([\d\.\-]+)")
+TIME_RE = re.compile(r"Generation time:\s*([\d\.\-]+)")
+
+
+# Line-at-a-time version of the old parse_log_file loop. feed() returns the
+# generation blocks it completed as (generation row, species rows); a block
+# completes at its "Generation time" line or when the next generation starts,
+# so only one generation is ever held in memory.
+class LogParser:
+    def __init__(self):
+        self.current = None
+        self.in_species_section = False
+
+    def _close(self):
+        done, self.current = self.current, None
+        if done is None:
+            return []
+        row = {field: done.get(field) for field in GENERATION_FIELDS}
+        species = [{'generation': done['generation'], **s} for s in done['species']]
+        return [(row, species)]
+
+    def feed(self, line):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return []
+
+        match_gen = GEN_RE.match(line)
+        if match_gen:
+            done = self._close()
+            self.current = {'generation': int(match_gen.group(1)), 'species': []}
+            self.in_species_section = False
+            return done
+
+        current = self.current
+        if not current:
+            return []
+
+        if "Population's average fitness" in line:
+            match = AVG_RE.search(line)
+            if match:
+                current['avg_fitness'] = float(match.group(1))
+                current['stdev_fitness'] = float(match.group(2))
+        elif "Best fitness" in line:
+            match = BEST_RE.search(line)
+            if match:
+                current['best_fitness'] = float(match.group(1))
+        elif "Average adjusted fitness" in line:
+            current['avg_adjusted_fitness'] = float(line.split(":")[1])
+        elif "Mean genetic distance" in line:
+            match = DIST_RE.search(line)
+            if match:
+                current['mean_genetic_distance'] = float(match.group(1))
+                current['std_genetic_distance'] = float(match.group(2))
+        elif "Generation time" in line:
+            match = TIME_RE.search(line)
+            if match:
+                current['gen_time'] = float(match.group(1))
+            return self._close()
+        elif "ID" in line and "stag" in line:
+            self.in_species_section = True
+        elif self.in_species_section:
+            if "Total extinctions" in line:
+                self.in_species_section = False
+                return []
+            # The "====" underline of the table header is not a species row
+            parts = line.split()
+            if len(parts) >= 6 and parts[0].isdigit():
+                current['species'].append({
+                    'id': parts[0],
+                    'age': parts[1],
+                    'size': parts[2],
+                    'fitness': parts[3],
+                    'adj_fit': parts[4],
+                    'stag': parts[5]
+                })
+        return []
+
+
+# Complete lines of a file from a byte offset, with the offset just past each
+# one. With follow=True it keeps waiting for new lines like `tail -f`, and an
+# unterminated last line is only returned once its newline is written.
+def read_lines(path, offset=0, follow=False, poll_interval=1.0):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            start = f.tell()
+            line = f.readline()
+            if line.endswith(b"\n") or (line and not follow):
+                yield line.decode('utf-8', errors='replace'), f.tell()
+            elif follow:
+                f.seek(start)
+                time.sleep(poll_interval)
+            else:
+                return
+
+
+# Generation blocks of a NEAT stdout log as (row, species rows, offset). The
+# offset is where parsing can resume without repeating or losing the block:
+# after its "Generation time" line, or at the header of the next generation.
+# A trailing block that is still being written is not emitted.
+def stream_log(path, offset=0, follow=False, poll_interval=1.0):
+    parser = LogParser()
+    line_start = offset
+    for line, line_end in read_lines(path, offset, follow, poll_interval):
+        resume_at = line_start if GEN_RE.match(line.strip()) else line_end
+        for row, species in parser.feed(line):
+            yield row, species, resume_at
+        line_start = line_end
+
+
+def _offset_path(output_csv):
+    return output_csv + ".offset"
+
+# Streams a log into the generation and species CSVs, writing each generation
+# as soon as it completes. With resume=True it appends to the CSVs from the
+# byte offset recorded by the previous call (kept in <output_csv>.offset)
+# instead of starting over; follow=True keeps tailing a log that is still
+# being written. Returns the number of generations written.
+def parse_log_file(log_path, output_csv, species_csv, resume=False, follow=False, poll_interval=1.0):
+    offset = 0
+    if resume and os.path.exists(_offset_path(output_csv)) and os.path.exists(output_csv) \
+            and os.path.exists(species_csv):
+        with open(_offset_path(output_csv)) as f:
+            offset = int(f.read().strip() or 0)
+        if offset > os.path.getsize(log_path):
+            offset = 0  # log was truncated or replaced
+    mode = 'a' if offset else 'w'
+
+    count = 0
+    with open(output_csv, mode, newline='') as gen_file, open(species_csv, mode, newline='') as species_file:
+        gen_writer = csv.DictWriter(gen_file, fieldnames=GENERATION_FIELDS)
+        species_writer = csv.DictWriter(species_file, fieldnames=SPECIES_FIELDS)
+        if not offset:
+            gen_writer.writeheader()
+            species_writer.writeheader()
+
+        for row, species, resume_at in stream_log(log_path, offset, follow, poll_interval):
+            gen_writer.writerow(row)
+            species_writer.writerows(species)
+            gen_file.flush()
+            species_file.flush()
+            with open(_offset_path(output_csv), 'w') as f:
+                f.write(str(resume_at))
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    log_file = sys.argv[1] if len(sys.argv) > 1 else "logs.txt"
+    follow = "--follow" in sys.argv
+    count = parse_log_file(log_file, "generation_stats.csv", "species_data.csv",
+                           resume=True, follow=follow)
+    print(f"✅ Parsed {count} new generations from {log_file}")
@@ -0,0 +1,211 @@
+import glob
+import json
+import os
+import time
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from neat.math_util import mean, stdev
+from neat.reporting import BaseReporter
+
+GENERATION_SCHEMA = pa.schema([
+    ("generation", pa.int32()),
+    ("population", pa.int32()),
+    ("num_species", pa.int32()),
+    ("avg_fitness", pa.float64()),
+    ("stdev_fitness", pa.float64()),
+    ("best_fitness", pa.float64()),
+    ("best_genome", pa.int64()),
+    ("best_species", pa.int32()),
+    ("best_nodes", pa.int32()),
+    ("best_connections", pa.int32()),
+    ("avg_adjusted_fitness", pa.float64()),
+    ("mean_genetic_distance", pa.float64()),
+    ("std_genetic_distance", pa.float64()),
+    ("gen_time", pa.float64()),
+    ("extinctions", pa.int32()),
+])
+SPECIES_SCHEMA = pa.schema([
+    ("generation", pa.int32()),
+    ("id", pa.int32()),
+    ("age", pa.int32()),
+    ("size", pa.int32()),
+    ("fitness", pa.float64()),
+    ("adj_fit", pa.float64()),
+    ("stag", pa.int32()),
+])
+PHASE_SCHEMA = pa.schema([
+    ("generation", pa.int32()),
+    ("phase", pa.string()),
+    ("seconds", pa.float64()),
+    ("calls", pa.int64()),
+])
+TABLES = {"generations": GENERATION_SCHEMA, "species": SPECIES_SCHEMA, "phases": PHASE_SCHEMA}
+
+
+# NEAT reporter that records the numbers StdOutReporter prints as typed
+# columns instead of text, computed from the population and species set
+# rather than parsed from reporter messages. Genetic distance is each
+# genome's distance to its species' representative; average adjusted fitness
+# is the mean over the species that survived reproduction. Every generation appends one record batch to
+# <run_dir>/generations-NNN.arrows and one (a row per species) to
+# species-NNN.arrows, both Arrow IPC streams flushed as they are written.
+# Given a PhaseTimer, its timings are taken every generation and written to
+# phases-NNN.arrows as (generation, phase, seconds, calls) rows. metadata, a
+# dict of settings the numbers depend on (the trainer's worker count, say),
+# is saved as metadata-NNN.json.
+# Each process that reports into run_dir (e.g. a run restored from a
+# checkpoint) starts a new NNN segment; load_run() stitches them together.
+class MetricsReporter(BaseReporter):
+    def __init__(self, run_dir, timer=None, metadata=None):
+        self.run_dir = run_dir
+        self.timer = timer
+        self.metadata = metadata
+        self.generation = None
+        self.generation_start = None
+        self.num_extinctions = 0
+        self.row = {}
+        self.files = None
+        self.writers = None
+
+    def _open(self):
+        os.makedirs(self.run_dir, exist_ok=True)
+        segment = len(glob.glob(os.path.join(self.run_dir, "generations-*.arrows")))
+        self.files, self.writers = {}, {}
+        for name, schema in TABLES.items():
+            path = os.path.join(self.run_dir, f"{name}-{segment:03d}.arrows")
+            self.files[name] = open(path, "wb")
+            self.writers[name] = ipc.new_stream(self.files[name], schema)
+        if self.metadata is not None:
+            with open(os.path.join(self.run_dir, f"metadata-{segment:03d}.json"), "w") as f:
+                json.dump(self.metadata, f, indent=2)
+
+    def _write(self, name, rows):
+        batch = pa.RecordBatch.from_pylist(rows, schema=TABLES[name])
+        self.writers[name].write_batch(batch)
+        self.files[name].flush()
+
+    def close(self):
+        if self.writers is not None:
+            for name in TABLES:
+                self.writers[name].close()
+                self.files[name].close()
+            self.files = self.writers = None
+
+    def start_generation(self, generation):
+        self.generation = generation
+        self.generation_start = time.time()
+        self.row = {"generation": generation}
+
+    def post_evaluate(self, config, population, species, best_genome):
+        fitnesses = [c.fitness for c in population.values()]
+        size = best_genome.size()
+        self.row.update(
+            population=len(population),
+            avg_fitness=mean(fitnesses),
+            stdev_fitness=stdev(fitnesses),
+            best_fitness=best_genome.fitness,
+            best_genome=best_genome.key,
+            best_species=species.get_species_id(best_genome.key),
+            best_nodes=size[0],
+            best_connections=size[1],
+        )
+
+        distances = []
+        for key, genome in population.items():
+            sid = species.genome_to_species.get(key)
+            if sid is not None:
+                distances.append(genome.distance(species.species[sid].representative,
+                                                 config.genome_config))
+        if distances:
+            self.row.update(mean_genetic_distance=mean(distances),
+                            std_genetic_distance=stdev(distances))
+
+    def complete_extinction(self):
+        self.num_extinctions += 1
+
+    def end_generation(self, config, population, species_set):
+        if self.generation is None:
+            return
+        if self.writers is None:
+            self._open()
+
+        species_rows = []
+        for sid in sorted(species_set.species):
+            s = species_set.species[sid]
+            species_rows.append({
+                "generation": self.generation,
+                "id": sid,
+                "age": self.generation - s.created,
+                "size": len(s.members),
+                "fitness": s.fitness,
+                "adj_fit": s.adjusted_fitness,
+                "stag": self.generation - s.last_improved,
+            })
+
+        adjusted = [row["adj_fit"] for row in species_rows if row["adj_fit"] is not None]
+        self.row.update(
+            avg_adjusted_fitness=mean(adjusted) if adjusted else None,
+            num_species=len(species_rows),
+            gen_time=time.time() - self.generation_start,
+            extinctions=self.num_extinctions,
+        )
+        self._write("generations", [self.row])
+        self._write("species", species_rows)
+        if self.timer is not None:
+            self._write("phases", [{"generation": self.generation, "phase": name,
+                                    "seconds": seconds, "calls": calls}
+                                   for name, (seconds, calls) in sorted(self.timer.take().items())])
+
+    # Reporters are pickled into every checkpoint with the species set; open
+    # files are not, so a restored copy starts a new segment on first write
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["files"] = state["writers"] = None
+        return state
+
+
+def _read_stream(path, schema):
+    batches = []
+    with open(path, "rb") as f:
+        try:
+            for batch in ipc.open_stream(f):
+                batches.append(batch)
+        except (pa.ArrowInvalid, OSError):
+            pass  # last batch is still being written
+    return pa.Table.from_batches(batches, schema=schema)
+
+# One table of a run as a pandas DataFrame. When segments overlap (a run
+# resumed from an earlier checkpoint), each generation's rows come from the
+# latest segment that recorded that generation.
+def load_table(run_dir, name):
+    paths = sorted(glob.glob(os.path.join(run_dir, "generations-*.arrows")))
+    owner = {}
+    for k, path in enumerate(paths):
+        for generation in _read_stream(path, GENERATION_SCHEMA).column("generation").to_pylist():
+            owner[generation] = k
+
+    tables = [TABLES[name].empty_table()]
+    for k, path in enumerate(paths):
+        path = path.replace("generations-", name + "-")
+        if os.path.exists(path):
+            table = _read_stream(path, TABLES[name])
+            keep = [owner.get(g) == k for g in table.column("generation").to_pylist()]
+            tables.append(table.filter(pa.array(keep, pa.bool_())))
+    df = pa.concat_tables(tables).to_pandas()
+    return df.sort_values("generation", kind="stable").reset_index(drop=True)
+
+# The metadata of each segment of a run, oldest first ({} where none was saved)
+def load_metadata(run_dir):
+    metadata = []
+    for path in sorted(glob.glob(os.path.join(run_dir, "generations-*.arrows"))):
+        path = path.replace("generations-", "metadata-").replace(".arrows", ".json")
+        if os.path.exists(path):
+            with open(path) as f:
+                metadata.append(json.load(f))
+        else:
+            metadata.append({})
+    return metadata
+
+# The generation and species tables of a run
+def load_run(run_dir):
+    return load_table(run_dir, "generations"), load_table(run_dir, "species")
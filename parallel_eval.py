@@ -0,0 +1,47 @@
+import multiprocessing
+
+
+# Same shape as neat.ParallelEvaluator, but hands each worker a whole shard of
+# the generation instead of one genome, so the world (platforms, culling) is
+# built once per shard. eval_function(genomes, config, *args) runs in the
+# worker and its return value is collected per shard, in genome order.
+# per_genome, a list with an item for each genome (compiled networks, say),
+# is split into the same shards and passed to eval_function after args.
+class ShardedEvaluator:
+    def __init__(self, num_workers, eval_function, timeout=None):
+        self.num_workers = num_workers
+        self.eval_function = eval_function
+        self.timeout = timeout
+        self.pool = None  # set first, so __del__ is quiet if Pool() raises
+        self.pool = multiprocessing.Pool(num_workers)
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def split(self, genomes):
+        # Contiguous, deterministic shards so a given population and worker
+        # count always produce the same worlds. Anything the eval function
+        # does across a shard (train_agent's culling) therefore sees only its
+        # shard, and results depend on the worker count.
+        n = min(self.num_workers, len(genomes))
+        size, extra = divmod(len(genomes), n) if n else (0, 0)
+        shards = []
+        start = 0
+        for k in range(n):
+            end = start + size + (1 if k < extra else 0)
+            shards.append(genomes[start:end])
+            start = end
+        return shards
+
+    def evaluate(self, genomes, config, *args, per_genome=None):
+        shards = self.split(genomes)
+        extra = [()] * len(shards) if per_genome is None else [(part,) for part in self.split(per_genome)]
+        jobs = [self.pool.apply_async(self.eval_function, (shard, config) + args + more)
+                for shard, more in zip(shards, extra)]
+        return [job.get(timeout=self.timeout) for job in jobs]
@@ -0,0 +1,45 @@
+import time
+from contextlib import nullcontext
+
+_DISABLED = nullcontext()
+
+
+# Cumulative wall time and call count per named phase. Off by default, when
+# phase() hands back a shared no-op context so instrumented code pays almost
+# nothing. take() returns {phase: (seconds, calls)} and starts over, and
+# merge() adds timings taken in another process (e.g. a worker's shard).
+class PhaseTimer:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.seconds = {}
+        self.calls = {}
+
+    def phase(self, name):
+        if not self.enabled:
+            return _DISABLED
+        return _Phase(self, name)
+
+    def add(self, name, seconds, calls=1):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + calls
+
+    def merge(self, timings):
+        for name, (seconds, calls) in timings.items():
+            self.add(name, seconds, calls)
+
+    def take(self):
+        timings = {name: (self.seconds[name], self.calls[name]) for name in self.seconds}
+        self.seconds, self.calls = {}, {}
+        return timings
+
+
+class _Phase:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, time.perf_counter() - self.start)
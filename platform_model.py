@@ -1,5 +1,10 @@
+import bisect
+import math
+import numpy as np
 import pygame
 
+SCAN_LIMIT = 32768  # agents x platforms below which a batched query just scans
+
 class Platform:
     def __init__(self, x, y, width, height, type="pad"):
         self.x, self.y = x, y
@@ -13,4 +18,136 @@ class Platform:
             "end": (255, 100, 0),
             "pad": (0, 200, 0)
         }.get(self.type, (0, 200, 0))
-        pygame.draw.rect(win, color, (self.x, self.y, self.width, self.height))
\ No newline at end of file
+        pygame.draw.rect(win, color, (self.x, self.y, self.width, self.height))
+
+# Nearest-platform lookups for a level. Platforms are sorted by y, so the ones
+# an agent can see (at or below it) are a suffix of that order. The order is
+# cut into blocks, and for each block the platforms from there to the end are
+# kept sorted by x: a query scans the few platforms left over in its first,
+# partial block and binary-searches one presorted suffix.
+class PlatformIndex:
+    def __init__(self, platforms, block=None):
+        self.platforms = platforms
+        self.plat_x = np.array([p.x for p in platforms], dtype=float)
+        self.plat_y = np.array([p.y for p in platforms], dtype=float)
+        self.by_y = np.lexsort((np.arange(len(platforms)), self.plat_y))
+        self.sorted_y = self.plat_y[self.by_y]
+        self.block = block or max(16, math.isqrt(len(platforms)))
+
+        # Suffix b holds by_y[b * block:] sorted by (x, index). first[] maps a
+        # position to the lowest index with the same x, for tie-breaking.
+        seg_x, seg_first, self.seg_start = [], [], []
+        for start in range(0, len(platforms), self.block):
+            suffix = self.by_y[start:]
+            suffix = suffix[np.lexsort((suffix, self.plat_x[suffix]))]
+            xs = self.plat_x[suffix]
+            run_start = np.r_[True, xs[1:] != xs[:-1]]
+            self.seg_start.append(len(seg_x))
+            seg_x.extend(xs.tolist())
+            seg_first.extend(suffix[np.maximum.accumulate(np.where(run_start, np.arange(len(xs)), 0))].tolist())
+        self.seg_start.append(len(seg_x))
+        self.seg_x = np.array(seg_x)
+        self.seg_first = np.array(seg_first, dtype=np.int64)
+        self._seg_x = seg_x
+        self._seg_first = seg_first
+        self._sorted_y = self.sorted_y.tolist()
+        self._by_y = self.by_y.tolist()
+
+        # Sweep-and-prune axis for collisions: left edges in x order
+        self.plat_w = np.array([p.width for p in platforms], dtype=float)
+        self.max_width = float(self.plat_w.max())
+        self.by_x = np.argsort(self.plat_x, kind="stable")
+        self.sorted_x = self.plat_x[self.by_x]
+        self._sorted_x = self.sorted_x.tolist()
+        self._by_x = self.by_x.tolist()
+
+    # Same answer as Player.get_nearest_platform_x / _y: among platforms at or
+    # below y, the x of the one nearest in x (first in list order on ties)
+    # and the nearest y. Falls back to (x, y) when nothing is visible.
+    def nearest_visible(self, x, y):
+        k = bisect.bisect_left(self._sorted_y, y)
+        if k == len(self._sorted_y):
+            return x, y
+
+        b = -(-k // self.block)
+        best = min((abs(x - self.platforms[i].x), i) for i in self._by_y[k:b * self.block]) \
+            if k < b * self.block else (math.inf, -1)
+        if b < len(self.seg_start) - 1:
+            lo, hi = self.seg_start[b], self.seg_start[b + 1]
+            pos = bisect.bisect_left(self._seg_x, x, lo, hi)
+            if pos < hi:
+                best = min(best, (self._seg_x[pos] - x, self._seg_first[pos]))
+            if pos > lo:
+                best = min(best, (x - self._seg_x[pos - 1], self._seg_first[pos - 1]))
+        return self.platforms[best[1]].x, self._sorted_y[k]
+
+    # nearest_visible for arrays of positions
+    def nearest_visible_batch(self, xs, ys):
+        n = len(self.platforms)
+        k = np.searchsorted(self.sorted_y, ys, side="left")
+        any_visible = k < n
+        ny = np.where(any_visible, self.sorted_y[np.minimum(k, n - 1)], ys)
+        # Small problems are cheaper as one dense scan than as a search
+        if n <= self.block or len(xs) * n <= SCAN_LIMIT:
+            nearest = self._scan(xs, ys)
+            return np.where(any_visible, self.plat_x[nearest], xs), ny
+
+        # Partial first block, scanned directly
+        b = -(-k // self.block)
+        pos = k[:, None] + np.arange(self.block)
+        partial = pos < np.minimum(b * self.block, n)[:, None]
+        cand = self.by_y[np.minimum(pos, n - 1)]
+        dist = np.where(partial, np.abs(xs[:, None] - self.plat_x[cand]), np.inf)
+        best = dist.min(axis=1)
+        nearest = np.where(partial & (dist == best[:, None]), cand, n).min(axis=1)
+
+        # Binary search in the presorted suffix
+        seg_start = np.asarray(self.seg_start)
+        has_seg = b < len(seg_start) - 1
+        lo = np.where(has_seg, seg_start[np.minimum(b, len(seg_start) - 1)], 0)
+        hi = np.where(has_seg, seg_start[np.minimum(b + 1, len(seg_start) - 1)], 0)
+        first, last = lo.copy(), hi.copy()
+        while True:
+            searching = lo < hi
+            if not searching.any():
+                break
+            mid = (lo + hi) // 2
+            left = searching & (self.seg_x[np.minimum(mid, len(self.seg_x) - 1)] < xs)
+            lo = np.where(left, mid + 1, lo)
+            hi = np.where(searching & ~left, mid, hi)
+
+        for p, ok in ((lo, lo < last), (lo - 1, lo > first)):
+            p = np.clip(p, 0, len(self.seg_x) - 1)
+            d = np.where(ok, np.abs(self.seg_x[p] - xs), np.inf)
+            i = self.seg_first[p]
+            better = ok & ((d < best) | ((d == best) & (i < nearest)))
+            best = np.where(better, d, best)
+            nearest = np.where(better, i, nearest)
+
+        nx = np.where(any_visible, self.plat_x[np.minimum(nearest, n - 1)], xs)
+        return nx, ny
+
+    # Broad phase: indexes, in list order, of the platforms whose x extent can
+    # overlap [x, x + width). Only these need Player.check_collision.
+    def collision_candidates(self, x, width):
+        lo = bisect.bisect_right(self._sorted_x, x - self.max_width)
+        hi = bisect.bisect_left(self._sorted_x, x + width)
+        return sorted(self._by_x[lo:hi])
+
+    # collision_candidates for arrays of positions, as a padded (len(xs), K)
+    # table of platform indexes and a mask of which entries are real
+    def collision_candidates_batch(self, xs, width):
+        n = len(self.platforms)
+        if len(xs) * n <= SCAN_LIMIT:
+            cand = np.broadcast_to(np.arange(n), (len(xs), n))
+            return cand, np.ones(cand.shape, dtype=bool)
+
+        lo = np.searchsorted(self.sorted_x, xs - self.max_width, side="right")
+        hi = np.searchsorted(self.sorted_x, xs + width, side="left")
+        pos = lo[:, None] + np.arange(max(int((hi - lo).max(initial=0)), 0))
+        valid = pos < hi[:, None]
+        return self.by_x[np.minimum(pos, n - 1)], valid
+
+    def _scan(self, xs, ys):
+        visible = self.plat_y[None, :] >= ys[:, None]
+        return np.where(visible, np.abs(xs[:, None] - self.plat_x), np.inf).argmin(axis=1)
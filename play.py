@@ -0,0 +1,226 @@
+import argparse
+import os
+import pickle
+import time
+import numpy as np
+from batch_network import ACTIVATIONS, SCALAR_ACTIVATIONS, compile_genome, load_network
+from fixed_step import TICK_RATE, FixedStep, aim, lerp, step_player
+from level import HEIGHT, WIDTH, get_fixed_level, load_level_set, start_position
+from platform_model import PlatformIndex
+from render_layer import Label, Scene
+from player import Player
+
+FPS = TICK_RATE
+EPISODE_TICKS = 60 * FPS    # same budgets as train_agent
+STAGNATION_TICKS = 5 * FPS
+
+
+# Turns a CompiledNetwork into one straight-line Python function of its
+# inputs: a local per node in evaluation order, links summed in link order,
+# so it returns the same outputs as FeedForwardNetwork.activate for about a
+# microsecond per call and no NumPy overhead.
+def compile_policy(net):
+    names = [f"x{i}" for i in range(net.num_inputs)] + ["0.0"]
+    names += [f"v{j}" for j in range(net.num_nodes)]
+    lines = [f"def policy({', '.join(names[:net.num_inputs])}):"]
+    for j in range(net.num_nodes):
+        start, end = net.link_start[j], net.link_start[j + 1]
+        terms = [f"{names[src]} * {float(w)!r}"
+                 for src, w in zip(net.link_src[start:end], net.link_weight[start:end])]
+        act = ACTIVATIONS[net.activation[j]][0]
+        lines.append(f"    {names[net.num_inputs + 1 + j]} = {act}({float(net.bias[j])!r} + "
+                     f"{float(net.response[j])!r} * ({' + '.join(terms) or '0.0'}))")
+    lines.append(f"    return ({''.join(names[s] + ', ' for s in net.output_slots)})")
+
+    scope = dict(SCALAR_ACTIVATIONS)
+    exec(compile("\n".join(lines), "<policy>", "exec"), scope)
+    return scope["policy"]
+
+# A policy from models/foo.bin, or from a pickled genome (which needs
+# neat-python and the training config to compile)
+def load_policy(path, config_file="config-feedforward.ini"):
+    if path.endswith(".bin"):
+        return compile_policy(load_network(path))
+    import neat
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation, config_file)
+    with open(path, "rb") as f:
+        return compile_policy(compile_genome(pickle.load(f), config))
+
+
+# One episode of the trainer's game with a single agent: same tick order,
+# physics, inputs and stopping rules as train_agent.simulate, without the
+# fitness shaping. Returns the outcome ("finished", "fell", "stalled" or
+# "timeout"), ticks, pads landed and jumps. latencies, if given, collects
+# each decision's policy time in ns; draw(player, tick) is called before
+# every tick.
+def play_episode(policy, platforms, index=None, latencies=None, draw=None,
+                 max_ticks=EPISODE_TICKS, stagnation_ticks=STAGNATION_TICKS):
+    index = index or PlatformIndex(platforms)
+    player = Player(*start_position(platforms))
+    width = max(WIDTH, max(p.x + p.width for p in platforms))
+    highest_y = None
+    last_pad_x = 0
+    last_progress = 0
+    landed_pads = set()
+    jumps = 0
+    tick = 0
+    outcome = "timeout"
+
+    def decide(player):
+        nonlocal highest_y, last_progress, jumps
+        if highest_y is None:
+            highest_y = player.y
+        elif player.y < highest_y:
+            highest_y = player.y
+            last_progress = tick
+
+        near_x, near_y = index.nearest_visible(player.x, player.y)
+        if latencies is None:
+            output = policy(player.x, player.y, player.vel_x, player.vel_y, near_x, near_y)[0]
+        else:
+            start = time.perf_counter_ns()
+            output = policy(player.x, player.y, player.vel_x, player.vel_y, near_x, near_y)[0]
+            latencies.append(time.perf_counter_ns() - start)
+        if not player.on_ground:
+            return None
+        jumps += 1
+        return aim(player, output * 180 - 90)
+
+    while tick < max_ticks:
+        if draw is not None:
+            draw(player, tick)
+        tick += 1
+        k = step_player(player, platforms, index, decide)
+        if k is not None:
+            if platforms[k].type == "pad" and k not in landed_pads:
+                landed_pads.add(k)
+                last_pad_x = platforms[k].x
+                last_progress = tick
+            elif platforms[k].type == "end":
+                outcome = "finished"
+                break
+        if player.x - last_pad_x > 50:
+            last_pad_x = player.x
+            last_progress = tick
+
+        if player.y > HEIGHT + 50 or player.x < -50 or player.x > width + 50:
+            outcome = "fell"
+            break
+        if stagnation_ticks and tick - last_progress >= stagnation_ticks:
+            outcome = "stalled"
+            break
+
+    return {"outcome": outcome, "ticks": tick, "pads": len(landed_pads), "jumps": jumps}
+
+
+# Draws episodes in a window: physics at the trainer's tick rate, frames at
+# display rate with the agent interpolated between ticks, redrawing only what
+# changed
+class Viewer:
+    def __init__(self, tick_rate=FPS):
+        import pygame
+        self.pygame = pygame
+        pygame.init()
+        self.win = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Jump King - play")
+        font = pygame.font.SysFont("comicsans", 24)
+        self.labels = [Label(font, (10, 10)), Label(font, (10, 40))]
+        self.scene = Scene(self.win)
+        self.stepper = FixedStep(tick_rate)
+        self.platforms = []
+        self.title = ""
+        self.prev = None
+
+    def episode(self, platforms, title):
+        self.platforms = platforms
+        self.title = title
+        self.prev = None
+
+    def __call__(self, player, tick):
+        self.stepper.wait(lambda alpha: self.frame(player, tick, alpha))
+        self.prev = (player.x, player.y)
+
+    def frame(self, player, tick, alpha):
+        pygame = self.pygame
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                raise SystemExit
+        self.scene.set_level(self.platforms)
+        self.scene.begin()
+        x, y = player.x, player.y
+        if self.prev is not None:
+            x, y = lerp(self.prev[0], x, alpha), lerp(self.prev[1], y, alpha)
+        self.scene.mark(player.draw(self.win, x, y))
+        for label, line in zip(self.labels, (self.title, f"Tick: {tick}")):
+            self.scene.mark(label.draw(self.win, line))
+        self.scene.present()
+
+
+# Plays the policy on every level `repeat` times and returns the episode
+# results plus timing: episodes per second and per-decision latency
+def evaluate_policy(policy, levels, repeat=1, viewer=None, measure_latency=True):
+    latencies = [] if measure_latency else None
+    results = []
+    start = time.perf_counter()
+    for level, platforms in levels:
+        index = PlatformIndex(platforms)
+        for _ in range(repeat):
+            if viewer is not None:
+                viewer.episode(platforms, f"Level {level}")
+            result = play_episode(policy, platforms, index, latencies, viewer)
+            results.append(dict(result, level=level))
+    elapsed = time.perf_counter() - start
+
+    timing = {"episodes_per_sec": len(results) / elapsed,
+              "ticks_per_sec": sum(r["ticks"] for r in results) / elapsed}
+    if latencies:
+        ns = np.array(latencies)
+        timing.update(latency_mean_us=ns.mean() / 1000, latency_p50_us=np.percentile(ns, 50) / 1000,
+                      latency_p99_us=np.percentile(ns, 99) / 1000)
+    return results, timing
+
+def parse_seeds(text):
+    seeds = []
+    for part in text.split(","):
+        low, _, high = part.partition("-")
+        seeds.extend(range(int(low), int(high) + 1) if high else [int(low)])
+    return seeds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play a trained model without training, headless or rendered")
+    parser.add_argument("model", help="models/foo.bin (or a pickled genome)")
+    parser.add_argument("--seeds", help="generated level seeds, e.g. 0-99 or 1,5,9 (default: the fixed level)")
+    parser.add_argument("--repeat", type=int, default=1, help="episodes per level")
+    parser.add_argument("--render", action="store_true", help="show the episodes in a window")
+    parser.add_argument("--no-latency", action="store_true", help="do not time individual decisions")
+    args = parser.parse_args()
+
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    policy = load_policy(args.model, os.path.join(local_dir, "config-feedforward.ini"))
+    print(f"Loaded {args.model} in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.seeds:
+        seeds = parse_seeds(args.seeds)
+        levels = list(zip(seeds, load_level_set(seeds).levels()))
+    else:
+        levels = [("fixed", get_fixed_level(HEIGHT))]
+    viewer = Viewer() if args.render else None
+    results, timing = evaluate_policy(policy, levels, args.repeat, viewer, not args.no_latency)
+
+    for result in results[:20]:
+        print(f"level {result['level']}: {result['outcome']} after {result['ticks']} ticks, "
+              f"{result['pads']} pads, {result['jumps']} jumps")
+    if len(results) > 20:
+        print(f"... {len(results) - 20} more episodes")
+    finished = sum(r["outcome"] == "finished" for r in results)
+    print(f"✅ Finished {finished}/{len(results)} episodes")
+    if viewer is None:  # rendered runs are paced at TICK_RATE, not measured
+        print(f"Headless: {timing['episodes_per_sec']:.0f} episodes/s, "
+              f"{timing['ticks_per_sec']:.0f} ticks/s")
+    if "latency_mean_us" in timing:
+        print(f"Decision latency: mean {timing['latency_mean_us']:.2f} us, "
+              f"p50 {timing['latency_p50_us']:.2f} us, p99 {timing['latency_p99_us']:.2f} us")
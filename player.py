@@ -4,6 +4,7 @@ import math
 class Player:
     def __init__(self, x, y):
         self.x, self.y = x, y
+        self.prev_y = y
         self.width, self.height = 20, 30
         self.vel_x, self.vel_y = 0, 0
         self.on_ground = False
@@ -11,10 +12,14 @@ class Player:
         self.aiming = False
         self.aim_timer = 0
         self.aim_max_time = 120
+        self.queued_jump = None
         self.fixed_power = 15
 
-    def draw(self, win):
-        pygame.draw.rect(win, (0, 0, 255), (self.x, self.y, self.width, self.height))
+    def draw(self, win, x=None, y=None):
+        # x, y: where to draw instead of the physics position (interpolation)
+        x = self.x if x is None else x
+        y = self.y if y is None else y
+        return pygame.draw.rect(win, (0, 0, 255), (x, y, self.width, self.height))
 
     def handle_input(self, event):
         if self.on_ground:
@@ -22,15 +27,20 @@ class Player:
                 self.aiming = True
                 self.aim_timer = 0
             elif event.type == pygame.KEYUP and event.key == pygame.K_SPACE and self.aiming:
-                dx, dy = self.get_aim_direction()
-                self.jump(dx, dy)
+                # Jumps on the next physics tick, like an agent's decision
+                self.queued_jump = self.get_aim_direction()
                 self.aiming = False
 
+    def take_jump(self):
+        direction, self.queued_jump = self.queued_jump, None
+        return direction
+
     def apply_gravity(self, g):
         self.vel_y += g
         self.vel_y = min(self.vel_y, 15)  # cap fall speed
 
     def update(self):
+        self.prev_y = self.y
         self.x += self.vel_x
         self.y += self.vel_y
 
@@ -72,18 +82,21 @@ class Player:
             y = self.y + self.height // 2 + vy * t + 0.5 * g * t * t
             points.append((int(x), int(y)))
             t += 0.1
-        for point in points:
-            pygame.draw.circle(win, (200, 0, 0), point, 3)
+        rects = [pygame.draw.circle(win, (200, 0, 0), point, 3) for point in points]
+        return rects[0].unionall(rects[1:])
 
-    def check_collision(self, plat):
+    def check_collision(self, plat, swept=True):
         px, py, pw, ph = self.x, self.y, self.width, self.height
         sx, sy, sw, sh = plat.x, plat.y, plat.width, plat.height
 
-        if px + pw > sx and px < sx + sw and py + ph > sy and py < sy + sh:
-            # Check if landing on top
-            if self.vel_y > 0 and py + ph <= sy + 10:
+        if px + pw > sx and px < sx + sw:
+            # Check if landing on top. The swept test looks at where the feet
+            # were before this frame's move, so a fall faster than the 10 px
+            # landing band still lands instead of sinking into the pad.
+            feet = self.prev_y + ph if swept else py + ph
+            if self.vel_y > 0 and py + ph > sy and feet <= sy + 10:
                 return "land"
-            else:
+            if py + ph > sy and py < sy + sh:
                 return "slide"
         return None
 
@@ -106,6 +119,7 @@ class Player:
             return self.y
         nearest = min(visible, key=lambda p: abs(self.y - p.y))
         return nearest.y
-    def slide(self):
-         # Simple slide behavior, e.g., reduce horizontal speed slightly
-         self.vel_x *= 0.9  # friction-like effect
\ No newline at end of file
+
+    def get_nearest_platform(self, index):
+        # Both coordinates above in one PlatformIndex lookup
+        return index.nearest_visible(self.x, self.y)
@@ -0,0 +1,79 @@
+import pygame
+
+BACKGROUND = (255, 255, 255)
+FULL_UPDATE_AREA = 0.5   # push the whole window once the dirty rects cover this share of it
+
+
+# A line of HUD text. The surface is rendered again only when the text
+# changes; otherwise each frame is just a blit of the cached surface.
+class Label:
+    def __init__(self, font, pos, align="left", color=(0, 0, 0)):
+        self.font = font
+        self.pos = pos
+        self.align = align
+        self.color = color
+        self.text = None
+        self.surface = None
+
+    def draw(self, win, text):
+        if text != self.text:
+            self.text = text
+            self.surface = self.font.render(text, 1, self.color)
+        x, y = self.pos
+        if self.align == "right":
+            x -= self.surface.get_width()
+        return win.blit(self.surface, (x, y))
+
+
+# Dirty-rect drawing over a cached level layer. set_level() draws the
+# background and platforms once into an off-screen surface. Each frame,
+# begin() copies that layer back over only the rects the last frame drew,
+# the frame marks every rect it draws, and present() sends only the erased
+# and newly drawn rects to the display (or the whole window when they would
+# cover most of it anyway).
+class Scene:
+    def __init__(self, win):
+        self.win = win
+        self.layer = None
+        self.platforms = None
+        self.drawn = []
+        self.erased = []
+        self.full = True
+        self.covered = 0.0   # share of the window the last frame's rects covered
+
+    def set_level(self, platforms):
+        if platforms is self.platforms:
+            return
+        self.platforms = platforms
+        self.layer = self.win.copy()
+        self.layer.fill(BACKGROUND)
+        for plat in platforms:
+            plat.draw(self.layer)
+        self.full = True
+
+    def begin(self):
+        if self.full or self.covered > FULL_UPDATE_AREA:
+            self.win.blit(self.layer, (0, 0))
+            self.erased = []
+            self.full = True
+        else:
+            self.win.blits([(self.layer, rect, rect) for rect in self.drawn], doreturn=False)
+            self.erased = self.drawn
+        self.drawn = []
+
+    def mark(self, rect):
+        if rect is not None:
+            self.drawn.append(rect)
+
+    def mark_all(self, rects):
+        self.drawn.extend(rects)
+
+    def present(self):
+        rects = self.erased + self.drawn
+        self.covered = sum(rect.width * rect.height for rect in rects) / \
+            (self.win.get_width() * self.win.get_height())
+        if self.full or self.covered > FULL_UPDATE_AREA:
+            pygame.display.update()
+            self.full = False
+        else:
+            pygame.display.update(rects)
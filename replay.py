@@ -0,0 +1,176 @@
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import numpy as np
+from level import HEIGHT, WIDTH, array_to_level, level_to_array
+
+REPLAY_DIR = "replays"
+AGENT_COLORS = [(0, 0, 255), (200, 0, 200), (0, 150, 150), (150, 100, 0), (120, 120, 120)]
+
+
+# One recorded episode: for each kept agent and tick, its position, the jump
+# angle it chose (NaN when it did not jump), the fitness that tick earned and
+# whether it was still alive, as (ticks, agents) float32/bool arrays, plus the
+# level and the agents' genome keys and final fitness.
+class Replay:
+    def __init__(self, x, y, jump_angle, fitness_delta, alive, genome_keys, fitness,
+                 platforms, generation=0, level=0, fps=60):
+        self.x = x
+        self.y = y
+        self.jump_angle = jump_angle
+        self.fitness_delta = fitness_delta
+        self.alive = alive
+        self.genome_keys = genome_keys
+        self.fitness = fitness
+        self.platforms = platforms
+        self.generation = generation
+        self.level = level
+        self.fps = fps
+
+    @property
+    def ticks(self):
+        return self.x.shape[0]
+
+    def to_bytes(self):
+        buf = io.BytesIO()
+        np.savez_compressed(buf, **self.__dict__)
+        return buf.getvalue()
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        for key in ("generation", "level", "fps"):
+            arrays[key] = arrays[key].item()
+        return cls(**arrays)
+
+
+# Collects every agent's per-tick state during simulate(); finish() keeps the
+# chosen agents' columns. Costs about 17 bytes per agent per tick while the
+# episode runs, so it is only used on recorded generations.
+class Recorder:
+    def __init__(self):
+        self.x, self.y, self.jump_angle, self.fitness_delta, self.alive = [], [], [], [], []
+        self.before = None
+        self.angles = None
+
+    def start_tick(self, fitness):
+        self.before = fitness.copy()
+        self.angles = np.full(len(fitness), np.nan, dtype=np.float32)
+
+    def jump(self, ids, angle):
+        self.angles[ids] = angle
+
+    def end_tick(self, world, fitness):
+        self.x.append(world.x.astype(np.float32))
+        self.y.append(world.y.astype(np.float32))
+        self.jump_angle.append(self.angles)
+        self.fitness_delta.append((fitness - self.before).astype(np.float32))
+        self.alive.append(world.alive.copy())
+
+    def finish(self, rows, genome_keys, fitness, platforms, **info):
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = [np.stack(series)[:, rows] for series in
+                   (self.x, self.y, self.jump_angle, self.fitness_delta, self.alive)]
+        return Replay(*columns, np.asarray(genome_keys), np.asarray(fitness)[rows],
+                      level_to_array(platforms), **info)
+
+
+# Draws a replay into off-screen surfaces, one per `every` ticks, on SDL's
+# dummy video driver so it works on headless machines
+def render_frames(replay, every=1):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from player import Player
+
+    pygame.init()
+    platforms = array_to_level(replay.platforms)
+    proto = Player(0, 0)
+    width = int(max(WIDTH, max(p.x + p.width for p in platforms)))
+    surface = pygame.Surface((width, HEIGHT))
+    font = pygame.font.SysFont("comicsans", 28)
+    total = np.cumsum(replay.fitness_delta, axis=0)
+
+    for t in range(0, replay.ticks, every):
+        surface.fill((255, 255, 255))
+        for plat in platforms:
+            plat.draw(surface)
+        for k in range(replay.x.shape[1]):
+            if not replay.alive[t, k] and (t == 0 or not replay.alive[t - 1, k]):
+                continue
+            x, y = float(replay.x[t, k]), float(replay.y[t, k])
+            color = AGENT_COLORS[k % len(AGENT_COLORS)]
+            pygame.draw.rect(surface, color, (x, y, proto.width, proto.height))
+            angle = replay.jump_angle[max(0, t - every + 1):t + 1, k]
+            angle = angle[~np.isnan(angle)]
+            if len(angle):
+                # Jump direction, as the aim line
+                cx, cy = x + proto.width / 2, y + proto.height / 2
+                rad = np.radians(float(angle[-1]))
+                pygame.draw.line(surface, (200, 0, 0), (cx, cy),
+                                 (cx + 40 * float(np.cos(rad)), cy + 40 * float(np.sin(rad))), 3)
+
+        lines = [f"Generation: {replay.generation}", f"Tick: {t}"]
+        lines += [f"Genome {key}: {total[t, k]:.1f}" for k, key in enumerate(replay.genome_keys)]
+        for i, line in enumerate(lines):
+            surface.blit(font.render(line, 1, (0, 0, 0)), (10, 10 + 30 * i))
+        yield surface
+
+def render_replay(path, frames_dir=None, gif=None, video=None, every=1):
+    import pygame
+    from PIL import Image
+
+    replay = Replay.load(path)
+    fps = replay.fps / every
+    images = []
+    encoder = None
+    if video:
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("Writing video needs ffmpeg on the PATH; use --gif or --frames instead")
+    if frames_dir:
+        os.makedirs(frames_dir, exist_ok=True)
+
+    try:
+        for i, surface in enumerate(render_frames(replay, every)):
+            if frames_dir:
+                pygame.image.save(surface, os.path.join(frames_dir, f"frame-{i:05d}.png"))
+            data = pygame.image.tobytes(surface, "RGB")
+            if gif:
+                images.append(Image.frombytes("RGB", surface.get_size(), data))
+            if video:
+                if encoder is None:
+                    w, h = surface.get_size()
+                    encoder = subprocess.Popen(
+                        ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                         "-s", f"{w}x{h}", "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", video],
+                        stdin=subprocess.PIPE)
+                encoder.stdin.write(data)
+    finally:
+        if encoder is not None:
+            encoder.stdin.close()
+            encoder.wait()
+
+    if gif and images:
+        images[0].save(gif, save_all=True, append_images=images[1:], duration=int(1000 / fps), loop=0)
+    return replay
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a recorded episode without a display")
+    parser.add_argument("replay", help="replays/gen-NNNN-level-K.npz")
+    parser.add_argument("--frames", help="directory for PNG frames")
+    parser.add_argument("--gif", help="animated GIF to write")
+    parser.add_argument("--video", help="video file to write with ffmpeg, e.g. best.mp4")
+    parser.add_argument("--every", type=int, default=2, help="render every Nth tick")
+    args = parser.parse_args()
+    if not (args.frames or args.gif or args.video):
+        parser.error("choose at least one of --frames, --gif, --video")
+
+    replay = render_replay(args.replay, args.frames, args.gif, args.video, args.every)
+    print(f"✅ Rendered {replay.ticks} ticks of generation {replay.generation}")
@@ -0,0 +1,195 @@
+import argparse
+import configparser
+import contextlib
+import glob
+import itertools
+import multiprocessing
+import os
+import random
+import time
+import traceback
+import pandas as pd
+
+CONFIG_FILE = "config-feedforward.ini"
+SWEEP_DIR = "sweeps"
+
+# Search space syntax, one --param per parameter:
+#   pop_size=50,150,300          values to try (grid or random choice)
+#   compatibility_threshold=2.5:3.5   range, random search only (ints stay ints)
+#   DefaultGenome.conn_add_prob=0.3,0.5   section only needed if ambiguous
+#   CULL_KILL=0.5,0.65           UPPERCASE names are train_agent constants
+
+def parse_value(text):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+def parse_param(spec, config):
+    name, _, values = spec.partition("=")
+    name = name.strip()
+    if not values:
+        raise ValueError(f"Expected name=values, got {spec!r}")
+    if ":" in values:
+        low, high = (parse_value(v) for v in values.split(":", 1))
+        domain = (low, high)
+    else:
+        domain = [parse_value(v) for v in values.split(",")]
+    return resolve(name, config), domain
+
+# ("trainer", NAME) for train_agent constants, otherwise (section, key)
+def resolve(name, config):
+    if name.isupper():
+        import train_agent
+        if not hasattr(train_agent, name):
+            raise ValueError(f"train_agent has no constant {name}")
+        return ("trainer", name)
+    if "." in name:
+        section, key = name.split(".", 1)
+        if not config.has_option(section, key):
+            raise ValueError(f"{CONFIG_FILE} has no [{section}] {key}")
+        return (section, key)
+    sections = [s for s in config.sections() if config.has_option(s, name)]
+    if not sections:
+        raise ValueError(f"{CONFIG_FILE} has no key {name}")
+    if len(sections) > 1:
+        raise ValueError(f"{name} is in several sections ({', '.join(sections)}); use Section.{name}")
+    return (sections[0], name)
+
+def grid(space):
+    for name, domain in space:
+        if isinstance(domain, tuple):
+            raise ValueError(f"{name} is a range; ranges need --random")
+    names = [name for name, _ in space]
+    for values in itertools.product(*(domain for _, domain in space)):
+        yield dict(zip(names, values))
+
+def random_search(space, count, rng):
+    for _ in range(count):
+        params = {}
+        for name, domain in space:
+            if isinstance(domain, list):
+                params[name] = rng.choice(domain)
+            elif all(isinstance(v, int) for v in domain):
+                params[name] = rng.randint(*domain)
+            else:
+                params[name] = rng.uniform(*domain)
+        yield params
+
+def param_label(name):
+    return name[1] if name[0] == "trainer" else f"{name[0]}.{name[1]}"
+
+
+# One training run, in its own process and directory (so best_genome.pkl,
+# checkpoints and runs/ stay apart) with stdout going to its logs.txt.
+# Returns the run's summary row; a failing run is reported, not raised.
+def run_one(job):
+    run_id, run_dir, base_config, params, generations, seed = job
+    os.makedirs(run_dir, exist_ok=True)
+    os.chdir(run_dir)
+
+    config = configparser.ConfigParser()
+    config.read(base_config)
+    trainer = {}
+    for (section, key), value in params.items():
+        if section == "trainer":
+            trainer[key] = value
+        else:
+            config.set(section, key, str(value))
+    with open("config-feedforward.ini", "w") as f:
+        config.write(f)
+
+    row = {"run": run_id, "seed": seed}
+    row.update({param_label(name): value for name, value in params.items()})
+    start = time.time()
+    with open("logs.txt", "w") as log, contextlib.redirect_stdout(log):
+        try:
+            import numpy as np
+            import train_agent
+            from metrics_reporter import load_run
+
+            train_agent.WORKERS = 1  # pool workers cannot start processes
+            train_agent.GENERATION_TO_RUN = generations
+            for key, value in trainer.items():
+                setattr(train_agent, key, value)
+            random.seed(seed)
+            np.random.seed(seed)
+            train_agent.run(os.path.abspath("config-feedforward.ini"))
+
+            stats, _ = load_run(glob.glob(os.path.join(train_agent.RUNS_DIR, "*"))[0])
+            best = stats["best_fitness"].idxmax()
+            row.update(
+                generations=len(stats),
+                best_fitness=stats["best_fitness"].max(),
+                best_generation=int(stats["generation"][best]),
+                final_avg_fitness=stats["avg_fitness"].iloc[-1],
+                final_species=int(stats["num_species"].iloc[-1]),
+                best_score=train_agent.BEST_SCORE,
+                error=None,
+            )
+        except Exception:
+            traceback.print_exc(file=log)
+            row["error"] = traceback.format_exc().strip().splitlines()[-1]
+    row["seconds"] = time.time() - start
+    return row
+
+def run_sweep(jobs, workers, sweep_dir):
+    rows = []
+    # A fresh process per run: train_agent keeps its counters in globals
+    with multiprocessing.Pool(workers, maxtasksperchild=1) as pool:
+        for row in pool.imap_unordered(run_one, jobs):
+            status = row["error"] or f"best fitness {row['best_fitness']:.2f}"
+            print(f"[{len(rows) + 1}/{len(jobs)}] run {row['run']}: {status} ({row['seconds']:.0f} s)")
+            rows.append(row)
+
+    results = pd.DataFrame(rows).sort_values("run").reset_index(drop=True)
+    results.to_csv(os.path.join(sweep_dir, "results.csv"), index=False)
+
+    # Every run's per-generation stats in one table, keyed by run
+    from metrics_reporter import load_run
+    tables = []
+    for job in jobs:
+        for path in glob.glob(os.path.join(job[1], "runs", "*")):
+            stats, _ = load_run(path)
+            tables.append(stats.assign(run=job[0]))
+    if tables:
+        pd.concat(tables).to_csv(os.path.join(sweep_dir, "generations.csv"), index=False)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grid or random search over NEAT config and trainer settings")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUES",
+                        help="parameter to sweep, e.g. pop_size=50,150 or CULL_KILL=0.5:0.8")
+    parser.add_argument("--random", type=int, metavar="N", help="N random samples instead of the full grid")
+    parser.add_argument("--repeats", type=int, default=1, help="runs (seeds) per parameter set")
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=os.path.join(SWEEP_DIR, time.strftime("sweep-%Y%m%d-%H%M%S")))
+    args = parser.parse_args()
+
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    base_config = os.path.join(local_dir, CONFIG_FILE)
+    config = configparser.ConfigParser()
+    config.read(base_config)
+    space = [parse_param(spec, config) for spec in args.param]
+
+    rng = random.Random(args.seed)
+    param_sets = list(random_search(space, args.random, rng) if args.random else grid(space))
+    sweep_dir = os.path.abspath(args.out)
+    os.makedirs(sweep_dir, exist_ok=True)
+    jobs = []
+    for params in param_sets:
+        for repeat in range(args.repeats):
+            run_id = len(jobs)
+            jobs.append((run_id, os.path.join(sweep_dir, f"run-{run_id:03d}"), base_config,
+                         params, args.generations, args.seed + run_id))
+
+    print(f"{len(jobs)} runs on {min(args.workers, len(jobs))} workers -> {sweep_dir}")
+    results = run_sweep(jobs, args.workers, sweep_dir)
+    if "best_fitness" in results:  # missing when every run failed
+        results = results.sort_values("best_fitness", ascending=False)
+    print(results.to_string(index=False))
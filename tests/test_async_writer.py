@@ -0,0 +1,68 @@
+import gzip
+import os
+import pickle
+import sys
+import threading
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import pytest
+import async_writer
+from async_writer import BackgroundWriter, write_atomic
+
+
+def test_write_atomic_replaces_without_leftovers(tmp_path):
+    path = tmp_path / "best_genome.pkl"
+    path.write_bytes(b"old")
+    write_atomic(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["best_genome.pkl"]
+
+def test_write_atomic_keeps_old_file_on_error(tmp_path, monkeypatch):
+    path = tmp_path / "best_genome.pkl"
+    path.write_bytes(b"old")
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(async_writer.os, "fsync", fail)
+    with pytest.raises(OSError):
+        write_atomic(str(path), b"new")
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["best_genome.pkl"]
+
+
+def test_writes_in_background_and_coalesces(tmp_path, monkeypatch):
+    # Hold the writer thread on its first file so later saves queue up
+    started, release = threading.Event(), threading.Event()
+    real_write = async_writer.write_atomic
+    written = []
+
+    def slow_write(path, data):
+        written.append(os.path.basename(path))
+        started.set()
+        release.wait(5)
+        real_write(path, data)
+    monkeypatch.setattr(async_writer, "write_atomic", slow_write)
+
+    writer = BackgroundWriter()
+    writer.dump(str(tmp_path / "first.pkl"), "first")
+    assert started.wait(5)
+    for k in range(5):
+        writer.dump(str(tmp_path / "best.pkl"), k)
+    writer.dump(str(tmp_path / "checkpoint"), [1, 2], compress=True)
+    release.set()
+    writer.close()
+
+    assert written == ["first.pkl", "best.pkl", "checkpoint"]  # one write for five saves
+    with open(tmp_path / "best.pkl", "rb") as f:
+        assert pickle.load(f) == 4
+    with gzip.open(tmp_path / "checkpoint") as f:
+        assert pickle.load(f) == [1, 2]
+
+def test_errors_reach_the_caller(tmp_path):
+    writer = BackgroundWriter()
+    writer.dump(str(tmp_path / "missing" / "best.pkl"), 1)
+    with pytest.raises(FileNotFoundError):
+        writer.flush()
+    writer.close()
@@ -0,0 +1,48 @@
+import os
+import pickle
+import random
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import neat
+import numpy as np
+from batch_network import ACTIVATION_IDS, BatchNetwork, compile_genome, load_network
+
+
+def load_config():
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                       neat.DefaultStagnation, os.path.join(REPO, "config-feedforward.ini"))
+
+def assert_matches(genome, config, net, inputs):
+    ffn = neat.nn.FeedForwardNetwork.create(genome, config)
+    expected = np.array([ffn.activate(x) for x in inputs.tolist()])
+    # NumPy's exp/tanh may be an ulp off math's, so not bit for bit
+    np.testing.assert_allclose(BatchNetwork([net] * len(inputs)).activate(inputs), expected,
+                               rtol=1e-9, atol=1e-12)
+
+
+def test_saved_models_match_feed_forward_network():
+    config = load_config()
+    inputs = np.random.default_rng(0).normal(0, 300, (2000, 6))
+    for name in ("best_genome_high_genocide", "best_genome_model_phase"):
+        with open(os.path.join(REPO, "models", name + ".pkl"), "rb") as f:
+            genome = pickle.load(f)
+        assert_matches(genome, config, compile_genome(genome, config), inputs)
+        assert_matches(genome, config, load_network(os.path.join(REPO, "models", name + ".bin")), inputs)
+
+
+# Every activation neat-python has, through heavily mutated genomes
+def test_mutated_genomes_match_feed_forward_network():
+    config = load_config()
+    config.genome_config.activation_options = list(ACTIVATION_IDS)
+    config.genome_config.activation_mutate_rate = 0.5
+    inputs = np.random.default_rng(1).normal(0, 3, (500, 6))
+    random.seed(1)
+    for key in range(60):
+        genome = config.genome_type(key)
+        genome.configure_new(config.genome_config)
+        for _ in range(10):
+            genome.mutate(config.genome_config)
+        assert_matches(genome, config, compile_genome(genome, config), inputs)
@@ -0,0 +1,77 @@
+import os
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import neat
+from batch_network import compile_genome
+from fitness_cache import FitnessCache, network_digest
+
+
+def test_lru_spills_to_disk_and_reloads(tmp_path):
+    path = str(tmp_path / "cache")
+    cache = FitnessCache(2, path)
+    for key in "abc":
+        cache.put(key, (ord(key), False))
+    assert len(cache) == 2
+    assert cache.get("a") == (97, False)  # evicted to disk, found again
+    assert cache.get("zz") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    cache = FitnessCache(10, path)
+    assert [cache.get(key) for key in "abc"] == [(97, False), (98, False), (99, False)]
+    cache.close()
+
+def test_lru_keeps_recently_used():
+    cache = FitnessCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+# Disabled connections and node numbering do not change the phenotype, so
+# they must not change the digest; a weight does
+def test_digest_follows_the_network_not_the_genome():
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, os.path.join(REPO, "config-feedforward.ini"))
+    genome = config.genome_type(1)
+    genome.configure_new(config.genome_config)
+    digest = network_digest(compile_genome(genome, config))
+
+    clone = config.genome_type(2)
+    clone.configure_new(config.genome_config)
+    clone.nodes, clone.connections = genome.nodes, dict(genome.connections)
+    dead = clone.create_connection(config.genome_config, 0, 0)
+    dead.enabled = False
+    assert dead.key not in genome.connections
+    clone.connections[dead.key] = dead
+    assert network_digest(compile_genome(clone, config)) == digest
+
+    next(iter(genome.connections.values())).weight += 1.0
+    assert network_digest(compile_genome(genome, config)) != digest
+
+# A second look at the same genomes is served from the cache, with the same
+# fitnesses and finishers as simulating them
+def test_evaluate_cached_reuses_results(tmp_path, monkeypatch):
+    import train_agent
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, os.path.join(REPO, "config-feedforward.ini"))
+    monkeypatch.setattr(train_agent, "EPISODE_TICKS", 300)
+    monkeypatch.setattr(train_agent, "FITNESS_CACHE", 100)
+    monkeypatch.setattr(train_agent, "FITNESS_CACHE_PATH", str(tmp_path / "cache"))
+    monkeypatch.setattr(train_agent, "CACHE", None)
+    population = neat.Population(config)
+    genomes = list(population.population.items())[:20]
+    levels = train_agent.get_levels()
+
+    first = train_agent.evaluate_cached(genomes, config, levels)
+    cache = train_agent.get_fitness_cache()
+    assert cache.hits == 0
+    second = train_agent.evaluate_cached(genomes, config, levels)
+    assert cache.hits == len(genomes)
+    assert first == second == tuple(train_agent.evaluate(genomes, config, levels, independent=True))
+    cache.close()
@@ -0,0 +1,54 @@
+import gzip
+import os
+import pickle
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import train_agent
+from islands import run_islands
+
+
+def write_config(path, pop_size):
+    with open(os.path.join(REPO, "config-feedforward.ini")) as f:
+        text = f.read()
+    lines = [f"pop_size              = {pop_size}" if line.startswith("pop_size") else line
+             for line in text.splitlines()]
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+def load_population(island_dir, generation):
+    with gzip.open(os.path.join(island_dir, train_agent.CHECKPOINT_PREFIX + str(generation))) as f:
+        return pickle.load(f)[2]
+
+# A genome's genes, which migration copies unchanged (only the key changes)
+def genes(genome):
+    return (tuple(sorted((k, c.weight, c.enabled) for k, c in genome.connections.items())),
+            tuple(sorted((k, n.bias, n.response, n.activation) for k, n in genome.nodes.items())))
+
+
+# Two islands, migrating after generation 1: the checkpoint each writes at the
+# end of generation 1 must hold the neighbour's genomes, which the neighbour
+# evaluated in generation 1 (its checkpoint 0 population)
+def test_migrants_arrive_on_each_island(tmp_path, monkeypatch):
+    config = tmp_path / "config.ini"
+    write_config(config, 10)
+    monkeypatch.setattr(train_agent, "EPISODE_TICKS", 120)  # forked islands inherit these
+    monkeypatch.setattr(train_agent, "CHECKPOINT_INTERVAL", 1)
+
+    out = tmp_path / "islands"
+    best = run_islands(str(config), islands=2, generations=3, out_dir=str(out),
+                       interval=2, migrants=2)
+    assert best.fitness is not None
+
+    for k in range(2):
+        island, neighbour = out / f"island-{k}", out / f"island-{(k - 1) % 2}"
+        before = load_population(island, 0)
+        after = load_population(island, 1)
+        sent = {genes(g) for g in load_population(neighbour, 0).values()}
+        arrived = [key for key, g in after.items() if genes(g) in sent]
+        assert len(arrived) == 2
+        assert not set(arrived) & set(before)  # re-keyed as new genomes
+        with open(island / "logs.txt") as f:
+            assert "Received 2 migrants" in f.read()
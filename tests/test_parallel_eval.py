@@ -0,0 +1,33 @@
+import gc
+import os
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import pytest
+from parallel_eval import ShardedEvaluator
+
+
+def shard_sum(genomes, config, offset, per_genome=None):
+    return [g + config + offset + (0 if per_genome is None else p)
+            for g, p in zip(genomes, per_genome or genomes)]
+
+def test_shards_are_contiguous_and_in_order():
+    evaluator = ShardedEvaluator(3, shard_sum)
+    try:
+        assert evaluator.split(list(range(7))) == [[0, 1, 2], [3, 4], [5, 6]]
+        shards = evaluator.evaluate(list(range(7)), 10, 100, per_genome=list(range(0, 70, 10)))
+        assert shards == [[110, 121, 132], [143, 154], [165, 176]]
+    finally:
+        evaluator.close()
+
+# A pool that cannot start reports its own error, not an AttributeError
+# from __del__ while the half-built evaluator is collected
+def test_failed_pool_is_collected_quietly(monkeypatch):
+    unraisable = []
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+    with pytest.raises(ValueError):
+        ShardedEvaluator(0, shard_sum)
+    gc.collect()
+    assert unraisable == []
@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import numpy as np
+import pytest
+from platform_model import Platform, PlatformIndex
+from player import Player
+
+
+# Integer coordinates on a coarse grid, so many platforms share an x or a y
+# and the first-in-list-order tie-break is exercised
+def random_platforms(n, seed):
+    rng = random.Random(seed)
+    return [Platform(rng.randrange(0, 1400, 10), rng.randrange(0, 600, 10),
+                     rng.randrange(20, 200, 10), 20) for _ in range(n)]
+
+def brute_force_nearest(platforms, x, y):
+    player = Player(x, y)
+    return player.get_nearest_platform_x(platforms), player.get_nearest_platform_y(platforms)
+
+
+@pytest.mark.parametrize("n", [1, 7, 40, 600])
+def test_nearest_visible_matches_scan(n):
+    platforms = random_platforms(n, n)
+    index = PlatformIndex(platforms)
+    rng = np.random.default_rng(n)
+    xs = np.concatenate([rng.uniform(-100, 1500, 1500), [p.x for p in platforms]])
+    ys = np.concatenate([rng.uniform(-50, 650, 1500), [p.y for p in platforms]])
+    expected = [brute_force_nearest(platforms, x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+    assert [index.nearest_visible(x, y) for x, y in zip(xs.tolist(), ys.tolist())] == expected
+    nx, ny = index.nearest_visible_batch(xs, ys)
+    assert list(zip(nx.tolist(), ny.tolist())) == expected
+
+
+# The broad phase may return extra platforms but never miss one whose x
+# extent overlaps the player, and keeps list order so the first landing wins
+@pytest.mark.parametrize("n", [5, 600])
+def test_collision_candidates_cover_every_overlap(n):
+    platforms = random_platforms(n, n + 1)
+    index = PlatformIndex(platforms)
+    player = Player(0, 0)
+    xs = np.random.default_rng(n).uniform(-250, 1650, 2000)
+    cand, valid = index.collision_candidates_batch(xs, player.width)
+    for row, x in enumerate(xs.tolist()):
+        overlapping = {k for k, p in enumerate(platforms) if p.x < x + player.width and x < p.x + p.width}
+        found = index.collision_candidates(x, player.width)
+        assert found == sorted(found)
+        assert overlapping <= set(found)
+        assert overlapping <= set(cand[row][valid[row]].tolist())
+
+# Player.check_collision through the broad phase gives the same first hit as
+# checking every platform
+def test_first_collision_matches_full_scan():
+    platforms = random_platforms(300, 3)
+    index = PlatformIndex(platforms)
+    rng = random.Random(3)
+    for _ in range(3000):
+        player = Player(rng.uniform(-50, 1450), rng.uniform(-50, 620))
+        player.prev_y = player.y - rng.uniform(0, 15)
+        player.vel_y = rng.uniform(-15, 15)
+        full = next(((k, r) for k, p in enumerate(platforms)
+                     if (r := player.check_collision(p)) is not None), None)
+        broad = next(((k, r) for k in index.collision_candidates(player.x, player.width)
+                      if (r := player.check_collision(platforms[k])) is not None), None)
+        assert broad == full
@@ -0,0 +1,52 @@
+import os
+import pickle
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import neat
+import numpy as np
+import train_agent
+from batch_network import compile_genome
+from level import generate_level
+from play import compile_policy, play_episode
+
+MODELS = ("best_genome_high_genocide", "best_genome_model_phase")
+
+
+def load_config():
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                       neat.DefaultStagnation, os.path.join(REPO, "config-feedforward.ini"))
+
+def load_genome(name):
+    with open(os.path.join(REPO, "models", name + ".pkl"), "rb") as f:
+        return pickle.load(f)
+
+
+def test_policy_matches_feed_forward_network():
+    config = load_config()
+    inputs = np.random.default_rng(0).normal(0, 300, (2000, 6)).tolist()
+    for name in MODELS:
+        genome = load_genome(name)
+        ffn = neat.nn.FeedForwardNetwork.create(genome, config)
+        policy = compile_policy(compile_genome(genome, config))
+        for x in inputs:
+            assert list(policy(*x)) == ffn.activate(x)
+
+# An episode in play.py ends as the same agent's independent episode in the
+# trainer does, on the same tick
+def test_episodes_match_simulate():
+    config = load_config()
+    genomes = [(k, load_genome(name)) for k, name in enumerate(MODELS)]
+    policies = [compile_policy(compile_genome(genome, config)) for _, genome in genomes]
+    for seed in range(6):
+        platforms = generate_level(seed)
+        finish_ticks = np.zeros(len(genomes), dtype=int)
+        _, finishers = train_agent.simulate(genomes, config, platforms=platforms, independent=True,
+                                            finish_ticks=finish_ticks)
+        for k, policy in enumerate(policies):
+            result = play_episode(policy, platforms)
+            assert (result["outcome"] == "finished") == (k in finishers)
+            if k in finishers:
+                assert result["ticks"] == finish_ticks[k]
@@ -0,0 +1,52 @@
+import gzip
+import importlib.util
+import os
+import pickle
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import train_agent
+from async_writer import AsyncCheckpointer
+
+CONFIG = os.path.join(REPO, "config-feedforward.ini")
+
+
+# A second copy of the trainer, as when a checkpoint is written by
+# `python train_agent.py` (module __main__) or by a sweep/island worker
+def load_trainer(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(REPO, "train_agent.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def read_checkpoint(path):
+    with gzip.open(path) as f:
+        return pickle.load(f)
+
+
+def test_resume_across_module_boundary(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    trainer = load_trainer("trainer_main")
+    trainer.CHECKPOINT_INTERVAL = 1
+    trainer.train(trainer.create_population(CONFIG), 2)
+    checkpoint = trainer.CHECKPOINT_PREFIX + "1"
+    assert os.path.exists(checkpoint)
+
+    # The writing module is gone; the checkpoint must not need it
+    del sys.modules["trainer_main"]
+    for reporter in read_checkpoint(checkpoint)[3].reporters.reporters:
+        if isinstance(reporter, AsyncCheckpointer):
+            assert reporter.state_function is None
+
+    monkeypatch.setattr(train_agent, "WRITER", None)
+    train_agent.resume(checkpoint, 2)
+    assert train_agent.GENERATION == 4
+
+    # The resumed run's own checkpoints carry the training state again
+    generation, *_, state = read_checkpoint(train_agent.CHECKPOINT_PREFIX + "3")
+    assert generation == 3
+    assert state["generation"] == 4
+    assert state["next_genome_key"] > max(read_checkpoint(checkpoint)[2])
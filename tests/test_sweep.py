@@ -0,0 +1,35 @@
+import os
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import pandas as pd
+from sweep import run_sweep
+
+CONFIG = os.path.join(REPO, "config-feedforward.ini")
+
+
+# Two short runs on a pool, one of which fails on a bad config value: the
+# good run is summarised from its metrics, the bad one reported, not raised
+def test_run_sweep_summarises_runs_and_failures(tmp_path):
+    jobs = []
+    for run_id, pop_size in enumerate([10, "abc"]):
+        params = {("NEAT", "pop_size"): pop_size, ("trainer", "EPISODE_TICKS"): 120}
+        jobs.append((run_id, str(tmp_path / f"run-{run_id:03d}"), CONFIG, params, 2, run_id))
+
+    results = run_sweep(jobs, 2, str(tmp_path))
+
+    assert results["run"].tolist() == [0, 1]
+    good, bad = results.iloc[0], results.iloc[1]
+    assert pd.isna(good["error"])
+    assert good["generations"] == 2
+    assert good["best_generation"] in (0, 1)
+    assert "pop_size" in bad["error"] or "invalid literal" in bad["error"]
+
+    assert len(pd.read_csv(tmp_path / "results.csv")) == 2
+    generations = pd.read_csv(tmp_path / "generations.csv")
+    assert generations["run"].tolist() == [0, 0]
+    assert (generations["population"] == 10).all()
+    with open(tmp_path / "run-000" / "config-feedforward.ini") as f:
+        assert "pop_size = 10" in f.read()
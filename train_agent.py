@@ -1,221 +1,486 @@
 import pygame
 import neat
+import hashlib
+import itertools
 import os
+import sys
 import time
-import math
-import pickle
-from player import Player
-from platform_model import Platform
-from neat.checkpoint import Checkpointer
+import numpy as np
+from async_writer import AsyncCheckpointer, BackgroundWriter
+from batch_network import BatchNetwork, compile_genome
+from batch_world import BatchWorld
+from fitness_cache import FitnessCache, network_digest
+from fixed_step import TICK_RATE, FixedStep
+from level import LevelSet, get_fixed_level, load_level_set, start_position
+from metrics_reporter import MetricsReporter
+from parallel_eval import ShardedEvaluator
+from phase_timer import PhaseTimer
+from render_layer import Label, Scene
+from replay import REPLAY_DIR, Recorder
 
-pygame.init()
 WIDTH, HEIGHT = 1400, 600
-FPS = 60
+FPS = TICK_RATE                 # physics ticks per second, shared with main.py and play.py
 GRAVITY = 0.4
 GENERATION = 0
 BEST_SCORE = 0
 GENERATION_TO_RUN = 50
 
-win = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Jump King AI")
-font = pygame.font.SysFont("comicsans", 28)
-
-def get_fixed_level():
-    platforms = []
-    ground_y = HEIGHT - 40
-    platforms.append(Platform(0, ground_y, 100, 20, "start"))
-
-    pads = [
-        (180, HEIGHT - 140),
-        (350, HEIGHT - 200),
-        (520, HEIGHT - 260),
-        (700, HEIGHT - 230),
-        (880, HEIGHT - 280),
-        (1050, HEIGHT - 200),
-    ]
-    for x, y in pads:
-        platforms.append(Platform(x, y, 100, 20, "pad"))
-
-    end_x = pads[-1][0] + 240
-    platforms.append(Platform(end_x, ground_y, 100, 20, "end"))
-    return platforms
-
-def draw_window(win, players, platforms, gen, best_score, score):
-    win.fill((255, 255, 255))
-    for plat in platforms:
-        plat.draw(win)
-
-    for p in players:
-        p.draw(win)
-
-    gen_text = font.render(f"Generation: {gen}", 1, (0, 0, 0))
-    alive_text = font.render(f"Alive: {len(players)}", 1, (0, 0, 0))
-    best_text = font.render(f"Best Score: {best_score}", 1, (0, 0, 0))
-    score_text = font.render(f"Score: {score}", 1, (0, 0, 0))
-
-    win.blit(gen_text, (10, 10))
-    win.blit(alive_text, (10, 40))
-    win.blit(best_text, (WIDTH - best_text.get_width() - 10, 10))
-    win.blit(score_text, (WIDTH - score_text.get_width() - 10, 40))
-
-    pygame.display.update()
+# Simulation-step clock: every budget is counted in physics ticks, never in
+# wall-clock time, so a genome gets the same steps on any host or evaluator.
+EPISODE_TICKS = 60 * FPS        # 60 s at the 60 FPS the agents were tuned on
+GENOCIDE_INTERVAL_TICKS = 20 * FPS
+TIME_PENALTY_PER_TICK = 0.01
+
+# Culling keeps the best CULL_KEEP of the living agents and kills the next
+# CULL_KILL; landing on a new pad pays PAD_REWARD, reaching the end END_REWARD
+CULL_KEEP = 0.35
+CULL_KILL = 0.65
+PAD_REWARD = 50
+END_REWARD = 300
+
+# An agent that goes STAGNATION_TICKS without a new best height, a new pad or
+# 50 px of forward progress is retired on the spot and keeps its fitness; the
+# episode ends once no agent is left that can still improve. 0 disables it.
+STAGNATION_TICKS = 5 * FPS
+
+# Headless training: no window, no frame cap, no drawing.
+# RENDER_EVERY > 0 opens a window and watches every Nth generation (numbered
+# as for RECORD_EVERY below): physics at FPS ticks per second, frames at
+# display rate (fixed_step).
+RENDER_EVERY = 0
+
+# RECORD_EVERY > 0 records every Nth generation's episodes (simulated
+# in-process) to REPLAY_DIR/gen-NNNN-level-K.npz, NNNN being the generation
+# as the reporters and checkpoints number it: per-tick positions, jump angles
+# and fitness changes of its RECORD_TOP best agents and of every finisher.
+# `python replay.py <file> --gif out.gif` renders one offline.
+RECORD_EVERY = 0
+RECORD_TOP = 1
+
+# WORKERS > 1 splits each generation into that many shards, each simulated in
+# its own headless world on a separate process. Culling and the end-of-episode
+# stop then apply per shard, so fitness depends on WORKERS (except with
+# FITNESS_CACHE, whose episodes are independent); the run's metadata records
+# it. Rendered generations always run in-process.
+WORKERS = 1
+EVALUATOR = None
+
+# Levels every genome is scored on. None keeps the hand-made get_fixed_level();
+# a list of seeds scores each genome on those generate_level() levels
+# (generated once and cached under levels/) and takes the mean fitness.
+LEVEL_SEEDS = None
+LEVELS = None
+
+# FITNESS_CACHE > 0 switches to independent episodes (no culling; reaching
+# the end retires only that agent), where fitness depends on nothing but the
+# genome's network and the levels, and memoizes it: elites and other repeated
+# networks reuse their score instead of being simulated again. Up to
+# FITNESS_CACHE results stay in memory (LRU); older ones and everything at the
+# end of training spill to FITNESS_CACHE_PATH for later runs and sweeps.
+# Bump EVALUATOR_VERSION whenever simulate()'s scoring changes.
+FITNESS_CACHE = 0
+FITNESS_CACHE_PATH = "fitness-cache"
+EVALUATOR_VERSION = 1
+CACHE = None
+
+# Genomes and checkpoints are written by a background thread (atomic, with
+# repeated best-genome saves coalesced) so disk I/O never stalls evaluation
+WRITER = None
+
+# Per-generation and per-species statistics are recorded in-process as Arrow
+# tables under RUNS_DIR/run-<start time>/ (see metrics_reporter.load_run)
+RUNS_DIR = "runs"
+
+# Checkpoints (every CHECKPOINT_INTERVAL generations) hold the whole training
+# state, so `python train_agent.py --resume <checkpoint>` picks a run back up
+CHECKPOINT_INTERVAL = 20
+CHECKPOINT_PREFIX = "neat-checkpoint-extinction"
+
+# PROFILE = True times each phase of evaluation (network creation, sensors,
+# activate, physics, collision, fitness, culling, rendering, event pumping)
+# and records seconds and calls per phase per generation with the run's
+# metrics. With WORKERS > 1 the seconds are summed over the workers.
+PROFILE = False
+TIMER = PhaseTimer()
+
+def get_writer():
+    global WRITER
+    if WRITER is None:
+        WRITER = BackgroundWriter()
+    return WRITER
+
+win = None
+font = None
+scene = None
+hud = None
+
+def get_window():
+    global win, font, scene, hud
+    if win is None:
+        pygame.init()
+        win = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Jump King AI")
+        font = pygame.font.SysFont("comicsans", 28)
+        scene = Scene(win)
+        hud = [Label(font, (10, 10)), Label(font, (10, 40)),
+               Label(font, (WIDTH - 10, 10), "right"), Label(font, (WIDTH - 10, 40), "right")]
+    return win
+
+def should_render(gen):
+    return RENDER_EVERY > 0 and gen % RENDER_EVERY == 0
+
+def should_record(gen):
+    return RECORD_EVERY > 0 and gen % RECORD_EVERY == 0
+
+# The NEAT generation being evaluated, counted from 0 like the reporters and
+# checkpoints (GENERATION counts evaluations from 1). Rendering, recording and
+# the HUD all go by this number.
+def neat_generation():
+    return POPULATION.generation if POPULATION is not None else GENERATION - 1
+
+def get_levels():
+    global LEVELS
+    if LEVELS is None:
+        if LEVEL_SEEDS is None:
+            LEVELS = LevelSet.from_levels([get_fixed_level(HEIGHT)])
+        else:
+            LEVELS = load_level_set(LEVEL_SEEDS, width=WIDTH, height=HEIGHT, gravity=GRAVITY)
+    return LEVELS
+
+# Only what changed reaches the display: the level is a cached layer, the HUD
+# text is re-rendered when its value changes, and just the agents' old and
+# new rects are updated (render_layer.Scene)
+def draw_window(win, world, platforms, gen, best_score, score, prev=None, alpha=1.0):
+    scene.set_level(platforms)
+    scene.begin()
+    scene.mark_all(world.draw(win, prev, alpha))
+
+    texts = (f"Generation: {gen}", f"Alive: {world.alive.sum()}",
+             f"Best Score: {best_score}", f"Score: {score}")
+    for label, text in zip(hud, texts):
+        scene.mark(label.draw(win, text))
+    scene.present()
 
 def eval_genomes(genomes, config):
     global GENERATION, BEST_SCORE
     GENERATION += 1
 
-    nets = []
-    players = []
-    ge = []
-    platforms = get_fixed_level()
+    generation = neat_generation()
+    render = should_render(generation)
+    record = should_record(generation)
+    levels = get_levels()
+    if FITNESS_CACHE:
+        fitnesses, finishers = evaluate_cached(genomes, config, levels, render, record)
+    else:
+        fitnesses, finishers = evaluate(genomes, config, levels, render, record=record)
+
+    for (genome_id, genome), fitness in zip(genomes, fitnesses):
+        genome.fitness = fitness
+
+    if finishers:
+        BEST_SCORE = max(BEST_SCORE, 100 * len(finishers))
+        get_writer().dump("best_genome.pkl", genomes[finishers[0]][1])
+
+# Simulates the genomes on every level, in shards on EVALUATOR if there is
+# one, and returns (fitnesses, indexes of the genomes that reached the end).
+# networks, if given, are the genomes' already compiled networks.
+def evaluate(genomes, config, levels, render=False, independent=False, record=False, networks=None):
+    if EVALUATOR is not None and not render and not record:
+        shards = EVALUATOR.evaluate(genomes, config, levels, False, independent, False,
+                                    per_genome=networks)
+    else:
+        shards = [simulate_levels(genomes, config, levels, render, independent, record, networks)]
+
+    fitnesses = []
+    finishers = []
+    for shard_fitnesses, shard_finishers, shard_timings in shards:
+        TIMER.merge(shard_timings)
+        finishers.extend(len(fitnesses) + i for i in shard_finishers)
+        fitnesses.extend(shard_fitnesses)
+    return fitnesses, finishers
+
+def get_fitness_cache():
+    global CACHE
+    if CACHE is None:
+        CACHE = FitnessCache(FITNESS_CACHE, FITNESS_CACHE_PATH)
+    return CACHE
+
+# Everything besides the network that decides an independent episode's score
+def cache_context(levels):
+    h = hashlib.sha1(repr((EVALUATOR_VERSION, WIDTH, HEIGHT, GRAVITY, EPISODE_TICKS,
+                           TIME_PENALTY_PER_TICK, STAGNATION_TICKS, PAD_REWARD,
+                           END_REWARD)).encode())
+    h.update(levels.platforms.tobytes())
+    h.update(levels.counts.tobytes())
+    return h.hexdigest()
+
+# evaluate() with independent episodes, reusing the stored result of any
+# genome whose network has been scored before on the same levels
+def evaluate_cached(genomes, config, levels, render=False, record=False):
+    cache = get_fitness_cache()
+    context = cache_context(levels)
+    with TIMER.phase("networks"):
+        networks = [compile_genome(genome, config) for _, genome in genomes]
+        keys = [context + network_digest(net) for net in networks]
+    results = [cache.get(key) for key in keys]
+
+    # Rendered and recorded generations simulate everyone, so there is
+    # something to watch
+    missing = [i for i, result in enumerate(results) if result is None or render or record]
+    if missing:
+        fitnesses, finishers = evaluate([genomes[i] for i in missing], config, levels,
+                                        render, independent=True, record=record,
+                                        networks=[networks[i] for i in missing])
+        finishers = set(finishers)
+        for k, i in enumerate(missing):
+            results[i] = (fitnesses[k], k in finishers)
+            cache.put(keys[i], results[i])
+
+    return [fitness for fitness, _ in results], [i for i, (_, done) in enumerate(results) if done]
+
+# simulate() on every level of a LevelSet, returning the mean fitnesses, the
+# genomes that reached the end on any level and the phase timings taken
+# while doing it (so a worker process can hand them back). networks are the
+# genomes' compiled networks, compiled here if not given.
+def simulate_levels(genomes, config, levels, render=False, independent=False, record=False,
+                    networks=None):
+    with TIMER.phase("networks"):
+        if networks is None:
+            nets = BatchNetwork.from_genomes(genomes, config)
+        else:
+            nets = BatchNetwork(networks)
+    total = np.zeros(len(genomes))
+    finished = set()
+    for level, platforms in enumerate(levels.levels()):
+        recorder = Recorder() if record else None
+        fitness, finishers = simulate(genomes, config, render, platforms, nets, independent, recorder)
+        total += fitness
+        finished.update(finishers)
+        if recorder is not None:
+            save_replay(recorder, genomes, fitness, finishers, platforms, level)
+    return (total / len(levels)).tolist(), sorted(finished), TIMER.take()
+
+# The RECORD_TOP best agents of an episode and its finishers, written by the
+# background writer
+def save_replay(recorder, genomes, fitness, finishers, platforms, level):
+    rows = list(np.argsort(-np.asarray(fitness), kind="stable")[:RECORD_TOP])
+    rows += [i for i in finishers if i not in rows]
+    generation = neat_generation()
+    replay = recorder.finish(rows, [genomes[i][0] for i in rows], fitness, platforms,
+                             generation=generation, level=level, fps=FPS)
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    path = os.path.join(REPLAY_DIR, f"gen-{generation:04d}-level-{level}.npz")
+    get_writer().submit(path, replay.to_bytes())
+
+# Runs one world over the given genomes and returns (fitnesses, finishers),
+# where finishers are the indexes of genomes that reached the end platform.
+# Genomes are not modified, so this can run in a worker process.
+# independent=True drops everything that couples agents (culling, and the
+# first finisher ending the episode for all), so each agent's fitness depends
+# only on its own network and the level. A Recorder, if given, gets every
+# agent's state each tick. start is an (xs, ys) pair to start each agent
+# somewhere other than the start platform's usual spot, and finish_ticks, an
+# array, receives the tick at which each finisher reached the end.
+def simulate(genomes, config, render=False, platforms=None, nets=None, independent=False,
+             recorder=None, start=None, finish_ticks=None):
+    if nets is None:
+        with TIMER.phase("networks"):
+            nets = BatchNetwork.from_genomes(genomes, config)
+    if platforms is None:
+        platforms = get_fixed_level(HEIGHT)
+    world = BatchWorld(platforms, len(genomes), *(start or start_position(platforms)))
+    width = max(WIDTH, max(p.x + p.width for p in platforms))
+    n = len(genomes)
+    fitness = np.zeros(n)
     score = 0
-    start_time = time.time()
-    last_genocide = time.time()
-
-    landed_platforms = [set() for _ in range(len(genomes))]
-
-    for genome_id, genome in genomes:
-        genome.fitness = 0
-        net = neat.nn.FeedForwardNetwork.create(genome, config)
-        nets.append(net)
-        players.append(Player(10, HEIGHT - 70))
-        ge.append(genome)
-
-    clock = pygame.time.Clock()
+    finishers = []
+    tick = 0
+    last_genocide = 0
+
+    highest_y = None
+    last_pad_x = np.zeros(n)  # Start from beginning
+    landed_pads = np.zeros((n, len(platforms)), dtype=bool)
+    last_progress = np.zeros(n, dtype=np.int64)  # tick of each agent's last progress
+    is_pad = world.plat_type == "pad"
+    is_end = world.plat_type == "end"
+
+    if render:
+        get_window()
+        stepper = FixedStep(FPS)
+        shown = None  # agent positions before the latest tick, to interpolate from
+
+        def frame(alpha):
+            with TIMER.phase("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        quit()
+            with TIMER.phase("render"):
+                draw_window(win, world, platforms, neat_generation(), max(BEST_SCORE, score), score,
+                            shown, alpha)
     run = True
 
-    while run and len(players) > 0:
-        clock.tick(FPS)
-        elapsed = time.time() - start_time
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-
-        for i in range(len(players) - 1, -1, -1):
-            player = players[i]
-            genome = ge[i]
-
-            player.apply_gravity(GRAVITY)
-            player.update()
-
-            # Init height tracking
-            if not hasattr(player, "highest_y"):
-                player.highest_y = player.y
-            elif player.y < player.highest_y:
-                player.highest_y = player.y
-                genome.fitness += 1  # Reward upward progress
-
-            # Inputs for neural net
-            inputs = (
-                player.x,
-                player.y,
-                player.vel_x,
-                player.vel_y,
-                player.get_nearest_platform_x(platforms),
-                player.get_nearest_platform_y(platforms)
-            )
-
-            output = nets[i].activate(inputs)
-            angle = output[0] * 180 - 90
-
-            if player.on_ground:
-                dx = player.fixed_power * math.cos(math.radians(angle))
-                dy = player.fixed_power * math.sin(math.radians(angle))
+    while run and world.alive.any():
+        if render:
+            stepper.wait(frame)
+            shown = (world.x.copy(), world.y.copy())
+        tick += 1
+        ids = world.live()
+        if recorder is not None:
+            recorder.start_tick(fitness)
+
+        with TIMER.phase("physics"):
+            world.apply_gravity(GRAVITY, ids)
+            world.update(ids)
+
+        # Init height tracking, then reward upward progress
+        with TIMER.phase("fitness"):
+            if highest_y is None:
+                highest_y = world.y.copy()
+            else:
+                up = ids[world.y[ids] < highest_y[ids]]
+                highest_y[up] = world.y[up]
+                fitness[up] += 1
+                last_progress[up] = tick
+
+        # Inputs for neural net
+        with TIMER.phase("sensors"):
+            near_x, near_y = world.nearest_platform(ids)
+            inputs = np.column_stack((world.x[ids], world.y[ids], world.vel_x[ids],
+                                      world.vel_y[ids], near_x, near_y))
+        with TIMER.phase("activate"):
+            output = nets.activate(inputs, ids)[:, 0]
+        angle = output * 180 - 90
+
+        with TIMER.phase("physics"):
+            jumping = world.on_ground[ids]
+            if jumping.any():
+                rad = np.radians(angle[jumping])
+                dx = world.fixed_power * np.cos(rad)
+                dy = world.fixed_power * np.sin(rad)
 
                 # Slight reward for initiating upward-forward jump
-                if dx > 0 and dy < 0:
-                    genome.fitness += 0.5
-
-                player.jump(dx, dy)
-
-            player.on_ground = False
-            landed = False
-
-            for plat in platforms:
-                result = player.check_collision(plat)
-
-                if result == "land":
-                    player.land_on(plat)
-
-                    # Reward only if this is a new platform and it's farther right
-                    if plat.type == "pad":
-                        if plat not in landed_platforms[i]:
-                            genome.fitness += 50  # One-time reward for landing here
-                            landed_platforms[i].add(plat)
-                            player.last_pad_x = plat.x  # track position
-                        else:
-                            # Small penalty for re-landing the same pad
-                            genome.fitness -= 10
-
-                    elif plat.type == "end":
-                        genome.fitness += 300  # Big reward for reaching the end
-                        score += 100
-                        BEST_SCORE = max(BEST_SCORE, score)
-                        with open("best_genome.pkl", "wb") as f:
-                            pickle.dump(genome, f)
-                        run = False
-                        break
-
-                    landed = True
-                    break
-
-                elif result == "slide":
-                    # Optional: very small edge-hit reward
-                    genome.fitness += 0.2
-
-            # Idle on platform
-            if not landed and player.on_ground:
-                genome.fitness -= 50  # Idling penalty
-
-            if not hasattr(player, "last_pad_x"):
-                player.last_pad_x = 0  # Start from beginning
-
-            forward_progress = player.x - player.last_pad_x
-            if forward_progress > 50:  # Has moved forward 50+ pixels
-                genome.fitness += 5
-                player.last_pad_x = player.x  # Update checkpoint
-          
+                jumpers = ids[jumping]
+                fitness[jumpers[(dx > 0) & (dy < 0)]] += 0.5
+
+                world.jump(jumpers, dx, dy)
+
+            world.on_ground[ids] = False
+            if recorder is not None:
+                recorder.jump(ids[jumping], angle[jumping])
+
+        with TIMER.phase("collision"):
+            plat, slides = world.collide(ids)
+            out = world.out_of_bounds(ids, width, HEIGHT)
+
+        with TIMER.phase("fitness"):
+            # Optional: very small edge-hit reward
+            fitness[ids] += 0.2 * slides
+
+            hit = plat >= 0
+            pad = np.zeros(len(ids), dtype=bool)
+            pad[hit] = is_pad[plat[hit]]
+            end = np.zeros(len(ids), dtype=bool)
+            end[hit] = is_end[plat[hit]]
+
+            # Reward only if this is a new pad; small penalty for re-landing it
+            pad_ids, pad_plat = ids[pad], plat[pad]
+            new = ~landed_pads[pad_ids, pad_plat]
+            fitness[pad_ids[new]] += PAD_REWARD  # One-time reward for landing here
+            fitness[pad_ids[~new]] -= 10
+            landed_pads[pad_ids[new], pad_plat[new]] = True
+            last_pad_x[pad_ids[new]] = world.plat_x[pad_plat[new]]  # track position
+            last_progress[pad_ids[new]] = tick
+
+            if end.any():
+                fitness[ids[end]] += END_REWARD  # Big reward for reaching the end
+                score += 100 * int(end.sum())
+                finishers.extend(ids[end].tolist())
+                if finish_ticks is not None:
+                    finish_ticks[ids[end]] = tick
+                if not independent:
+                    run = False
+
+            # Idle on platform (landing on the end stops the scan before the
+            # landing is recorded, so it also pays the idling penalty)
+            fitness[ids[end]] -= 50  # Idling penalty
+
+            forward = ids[world.x[ids] - last_pad_x[ids] > 50]  # Has moved forward 50+ pixels
+            fitness[forward] += 5
+            last_pad_x[forward] = world.x[forward]  # Update checkpoint
+            last_progress[forward] = tick
+
             # Penalize bouncing on the same platform
-            if player.on_ground and plat in landed_platforms[i]:
-                genome.fitness -= 0.2  # Discourage bouncing on same platform
-          
+            fitness[ids[pad]] -= 0.2
+
             # Penalize falling or leaving bounds
-            if player.y > HEIGHT + 50 or player.x < -50 or player.x > WIDTH + 50:
-                genome.fitness -= 20
-                nets.pop(i)
-                ge.pop(i)
-                players.pop(i)
-                landed_platforms.pop(i)
-                continue
+            fitness[ids[out]] -= 20
+            world.kill(ids[out])
 
             # Time penalty (encourage faster solutions)
-            genome.fitness -= 0.01
+            fitness[ids[~out]] -= TIME_PENALTY_PER_TICK
+
+            if independent:
+                world.kill(ids[end])  # finished agents stop here
 
-        # Genocide (kill lowest 50% every 20 sec if too many)
-        if time.time() - last_genocide > 20 and len(players) > 4:
-            fitnesses = [(idx, ge[idx].fitness) for idx in range(len(players))]
-            fitnesses.sort(key=lambda x: x[1], reverse=True)
-            top_35 = int(len(players) * 0.35)
-            bottom_65 = int(len(players) * 0.65)
+        # Genocide (keep the top CULL_KEEP, kill the next CULL_KILL of the
+        # living every GENOCIDE_INTERVAL_TICKS if too many)
+        with TIMER.phase("culling"):
+            if STAGNATION_TICKS:
+                world.kill(ids[tick - last_progress[ids] >= STAGNATION_TICKS])
 
-            kill_indices = [idx for idx, _ in fitnesses[top_35:top_35 + bottom_65]]
-            for idx in sorted(kill_indices, reverse=True):
-                nets.pop(idx)
-                ge.pop(idx)
-                players.pop(idx)
-                landed_platforms.pop(idx)
+            ids = world.live()
+            if not independent and tick - last_genocide >= GENOCIDE_INTERVAL_TICKS and len(ids) > 4:
+                ranked = ids[np.argsort(-fitness[ids], kind="stable")]
+                top = int(len(ids) * CULL_KEEP)
+                bottom = int(len(ids) * CULL_KILL)
+                world.kill(ranked[top:top + bottom])
 
-            last_genocide = time.time()
+                last_genocide = tick
 
-        draw_window(win, players, platforms, GENERATION, BEST_SCORE, score)
+        if recorder is not None:
+            recorder.end_tick(world, fitness)
 
-        if elapsed > 60:
+        if tick >= EPISODE_TICKS:
             break
 
+    return fitness.tolist(), sorted(finishers)
+
+
+# Everything outside the checkpointed population that a resumed run needs
+# to carry on exactly: the counters above, NumPy's RNG, the next genome key
+# and the best genome seen so far
+POPULATION = None
+
+def get_training_state():
+    reproduction = POPULATION.reproduction
+    next_key = next(reproduction.genome_indexer)
+    reproduction.genome_indexer = itertools.count(next_key)
+    return {
+        "generation": GENERATION,
+        "best_score": BEST_SCORE,
+        "numpy_random": np.random.get_state(),
+        "next_genome_key": next_key,
+        "ancestors": reproduction.ancestors,
+        "best_genome": POPULATION.best_genome,
+    }
+
+def set_training_state(p, state):
+    global GENERATION, BEST_SCORE
+    GENERATION = state["generation"]
+    BEST_SCORE = state["best_score"]
+    np.random.set_state(state["numpy_random"])
+    p.reproduction.genome_indexer = itertools.count(state["next_genome_key"])
+    p.reproduction.ancestors = state["ancestors"]
+    p.best_genome = state["best_genome"]
+
 
 def run(config_file):
+    return train(create_population(config_file), GENERATION_TO_RUN)
+
+# A fresh population with the trainer's reporters: stdout, statistics,
+# metrics and checkpoints
+def create_population(config_file):
     config = neat.Config(
         neat.DefaultGenome,
         neat.DefaultReproduction,
@@ -228,21 +493,67 @@ def run(config_file):
     p.add_reporter(neat.StdOutReporter(True))
     stats = neat.StatisticsReporter()
     p.add_reporter(stats)
+    p.add_reporter(MetricsReporter(os.path.join(RUNS_DIR, time.strftime("run-%Y%m%d-%H%M%S"))))
 
-    # Save checkpoint every 20 generations
-    p.add_reporter(Checkpointer(
-        generation_interval=20,
+    # Save checkpoint every CHECKPOINT_INTERVAL generations
+    p.add_reporter(AsyncCheckpointer(
+        get_writer(),
+        generation_interval=CHECKPOINT_INTERVAL,
         time_interval_seconds=None,
-        filename_prefix="neat-checkpoint-extinction"
+        filename_prefix=CHECKPOINT_PREFIX,
+        state_function=get_training_state,
     ))
-
-    winner = p.run(eval_genomes, GENERATION_TO_RUN)
+    return p
+
+# Continues a run from one of its checkpoints: population, species, reporters
+# (statistics, metrics and checkpointing carry on where they were), counters
+# and RNG state, then runs the rest of GENERATION_TO_RUN (or `generations`).
+def resume(checkpoint_file, generations=None):
+    p, state = AsyncCheckpointer.restore_checkpoint(checkpoint_file)
+    if state is not None:
+        set_training_state(p, state)
+    for reporter in p.reporters.reporters:
+        if isinstance(reporter, AsyncCheckpointer):
+            reporter.writer = get_writer()
+            reporter.state_function = get_training_state
+
+    if generations is None:
+        generations = GENERATION_TO_RUN - p.generation
+    print(f"Resuming from {checkpoint_file} at generation {p.generation}")
+    train(p, generations)
+
+def train(p, generations):
+    global EVALUATOR, POPULATION, CACHE
+    POPULATION = p
+    TIMER.enabled = PROFILE  # before the workers fork, so they inherit it
+    if WORKERS > 1:
+        EVALUATOR = ShardedEvaluator(WORKERS, simulate_levels)
+
+    metrics = [r for r in p.reporters.reporters if isinstance(r, MetricsReporter)]
+    for reporter in metrics:
+        reporter.timer = TIMER if PROFILE else None
+        reporter.metadata = {"workers": WORKERS, "independent_episodes": bool(FITNESS_CACHE)}
+
+    winner = p.run(eval_genomes, generations)
+    if EVALUATOR is not None:
+        EVALUATOR.close()
+        EVALUATOR = None
+    for reporter in metrics:
+        reporter.close()
+    if CACHE is not None:
+        CACHE.close()
+        CACHE = None
 
     print("\nBest genome:\n", winner)
-    with open("best_genome.pkl", "wb") as f:
-        pickle.dump(winner, f)
+    get_writer().dump("best_genome.pkl", winner)
+    get_writer().flush()
+    return winner
 
 if __name__ == "__main__":
-    local_dir = os.path.dirname(__file__)
-    config_path = os.path.join(local_dir, "config-feedforward.ini")
-    run(config_path)
+    # python train_agent.py [--resume neat-checkpoint-extinctionN]
+    if len(sys.argv) > 2 and sys.argv[1] == "--resume":
+        resume(sys.argv[2])
+    else:
+        local_dir = os.path.dirname(__file__)
+        config_path = os.path.join(local_dir, "config-feedforward.ini")
+        run(config_path)
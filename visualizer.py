@@ -1,171 +1,226 @@
+import hashlib
+import json
 import os
-import re
-import csv
+import time
+import numpy as np
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.ticker import MaxNLocator
+import log_stream
+from metrics_reporter import load_run
 
-def parse_log_file(log_path, output_csv, species_csv):
-    with open(log_path, 'r') as f:
-        lines = f.readlines()
-
-    generations = []
-    current_gen = None
-    in_species_section = False
-
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-
-        match_gen = re.match(r"\*\*\*\*\*\* Running generation (\d+) \*\*\*\*\*\*", line)
-        if match_gen:
-            if current_gen:
-                generations.append(current_gen)
-            current_gen = {'generation': int(match_gen.group(1)), 'species': []}
-            in_species_section = False
-            continue
-
-        if not current_gen:
-            continue
-
-        if "Population's average fitness" in line:
-            match = re.search(r"Population's average fitness:\s*([\d\.\-]+)\s*stdev:\s*([\d\.\-]+)", line)
-            if match:
-                current_gen['avg_fitness'] = float(match.group(1))
-                current_gen['stdev_fitness'] = float(match.group(2))
-        elif "Best fitness" in line:
-            match = re.search(r"Best fitness:\s*([\d\.\-]+)", line)
-            if match:
-                current_gen['best_fitness'] = float(match.group(1))
-        elif "Average adjusted fitness" in line:
-            current_gen['avg_adjusted_fitness'] = float(line.split(":")[1])
-        elif "Mean genetic distance" in line:
-            match = re.search(r"Mean genetic distance\s*([\d\.\-]+),\s*standard deviation\s*([\d\.\-]+)", line)
-            if match:
-                current_gen['mean_genetic_distance'] = float(match.group(1))
-                current_gen['std_genetic_distance'] = float(match.group(2))
-        elif "Generation time" in line:
-            match = re.search(r"Generation time:\s*([\d\.\-]+)", line)
-            if match:
-                current_gen['gen_time'] = float(match.group(1))
-        elif "ID" in line and "stag" in line:
-            in_species_section = True
-            continue
-        elif in_species_section:
-            if "Total extinctions" in line:
-                in_species_section = False
-                continue
-            parts = line.split()
-            if len(parts) >= 6:
-                species = {
-                    'id': parts[0],
-                    'age': parts[1],
-                    'size': parts[2],
-                    'fitness': parts[3],
-                    'adj_fit': parts[4],
-                    'stag': parts[5]
-                }
-                current_gen['species'].append(species)
-
-    if current_gen:
-        generations.append(current_gen)
-
-    with open(output_csv, 'w', newline='') as csvfile:
-        fieldnames = ['generation', 'avg_fitness', 'stdev_fitness', 'best_fitness',
-                      'avg_adjusted_fitness', 'mean_genetic_distance', 'std_genetic_distance', 'gen_time']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for gen in generations:
-            writer.writerow({
-                'generation': gen.get('generation'),
-                'avg_fitness': gen.get('avg_fitness'),
-                'stdev_fitness': gen.get('stdev_fitness'),
-                'best_fitness': gen.get('best_fitness'),
-                'avg_adjusted_fitness': gen.get('avg_adjusted_fitness'),
-                'mean_genetic_distance': gen.get('mean_genetic_distance'),
-                'std_genetic_distance': gen.get('std_genetic_distance'),
-                'gen_time': gen.get('gen_time'),
-            })
-
-    with open(species_csv, 'w', newline='') as csvfile:
-        fieldnames = ['generation', 'id', 'age', 'size', 'fitness', 'adj_fit', 'stag']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for gen in generations:
-            for s in gen['species']:
-                writer.writerow({'generation': gen['generation'], **s})
+def parse_log_file(log_path, output_csv, species_csv, resume=False, follow=False):
+    # Streams the log generation by generation; see log_stream.parse_log_file
+    return log_stream.parse_log_file(log_path, output_csv, species_csv, resume=resume, follow=follow)
 
 
 def plot_all(csv_path, species_csv, output_dir):
-    import matplotlib.cm as cm
-    import numpy as np
-
-    os.makedirs(output_dir, exist_ok=True)
     df = pd.read_csv(csv_path)
     species_df = pd.read_csv(species_csv)
     species_df["size"] = pd.to_numeric(species_df["size"], errors='coerce')
     species_df.dropna(subset=["size"], inplace=True)
-
-    num_gens = len(df)
-    colors = cm.get_cmap('tab20', num_gens)
-
-    # Plot 1: Fitness (simple line with generation-colored dots)
-    plt.figure(figsize=(10, 5))
-    plt.plot(df["generation"], df["best_fitness"], color='gray', linestyle='--', label="Best Fitness")
-    plt.plot(df["generation"], df["avg_fitness"], color='black', linestyle='-', label="Average Fitness")
-    for i in range(num_gens):
-        plt.scatter(df["generation"][i], df["best_fitness"][i], color=colors(i), s=40)
-        plt.scatter(df["generation"][i], df["avg_fitness"][i], color=colors(i), marker='x', s=40)
-    plt.xlabel("Generation")
-    plt.ylabel("Fitness")
-    plt.title("Fitness per Generation")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/fitness_simple.png")
-    plt.close()
-
-    # Plot 2: Genetic Distance
-    plt.figure(figsize=(10, 5))
-    plt.plot(df["generation"], df["mean_genetic_distance"], color='black', linestyle='-')
-    for i in range(num_gens):
-        plt.scatter(df["generation"][i], df["mean_genetic_distance"][i], color=colors(i), s=40)
-    plt.xlabel("Generation")
-    plt.ylabel("Mean Genetic Distance")
-    plt.title("Genetic Distance per Generation")
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/genetic_distance_simple.png")
-    plt.close()
-
-    # Plot 3: Generation Time
-    plt.figure(figsize=(10, 5))
-    plt.plot(df["generation"], df["gen_time"], color='black', linestyle='-')
-    for i in range(num_gens):
-        plt.scatter(df["generation"][i], df["gen_time"][i], color=colors(i), s=40)
-    plt.xlabel("Generation")
-    plt.ylabel("Generation Time (s)")
-    plt.title("Generation Time per Generation")
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/generation_time_simple.png")
-    plt.close()
-
-    # Plot 4: Species Sizes (stacked bars, clean)
-    pivot = species_df.pivot_table(index="generation", columns="id", values="size", aggfunc="sum", fill_value=0)
-    pivot.plot(kind='bar', stacked=True, figsize=(12, 5), colormap='tab20')
-    plt.title("Species Size per Generation")
-    plt.xlabel("Generation")
-    plt.ylabel("Size")
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/species_sizes_simple.png")
-    plt.close()
-
-    print(f"✅ Simple plots saved in: {output_dir}")
+    plot_frames(df, species_df, output_dir)
+
+
+# Same plots from a training run's metrics store (train_agent RUNS_DIR/run-*)
+def plot_run(run_dir, output_dir):
+    df, species_df = load_run(run_dir)
+    plot_frames(df, species_df, output_dir)
+
+
+def plot_frames(df, species_df, output_dir):
+    dashboard = Dashboard(output_dir)
+    updated = dashboard.update(df, species_df)
+    dashboard.close()
+    print(f"✅ Simple plots saved in: {output_dir} ({len(updated)} updated, "
+          f"{len(CHARTS) + 1 - len(updated)} unchanged)")
+
+
+# Line charts: (file, title, y label, [(column, line style, scatter style)])
+CHARTS = [
+    ("fitness_simple.png", "Fitness per Generation", "Fitness", [
+        ("best_fitness", dict(color='gray', linestyle='--', label="Best Fitness"), dict(s=40)),
+        ("avg_fitness", dict(color='black', linestyle='-', label="Average Fitness"), dict(marker='x', s=40)),
+    ]),
+    ("genetic_distance_simple.png", "Genetic Distance per Generation", "Mean Genetic Distance", [
+        ("mean_genetic_distance", dict(color='black', linestyle='-'), dict(s=40)),
+    ]),
+    ("generation_time_simple.png", "Generation Time per Generation", "Generation Time (s)", [
+        ("gen_time", dict(color='black', linestyle='-'), dict(s=40)),
+    ]),
+]
+SPECIES_CHART = "species_sizes_simple.png"
+STATE_FILE = ".plot_state.json"  # digest of the data behind each saved PNG
+MAX_LEGEND_SPECIES = 20
+
+def _digest(frame):
+    return hashlib.sha1(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()).hexdigest()
+
+def _point_colors(n):
+    # Same per-generation colours as the old cm.get_cmap('tab20', n)(i) loop
+    return matplotlib.colormaps['tab20'].resampled(max(n, 1))(np.arange(n))
+
+
+# The training charts as long-lived figures. update() only redraws and saves
+# the charts whose data changed since they were last saved (tracked across
+# runs in output_dir/.plot_state.json), and updates their existing artists in
+# place. Each scatter series is one collection with per-point colours, not
+# one artist per generation. show=True keeps the figures on screen.
+class Dashboard:
+    def __init__(self, output_dir, show=False):
+        self.output_dir = output_dir
+        self.show = show
+        os.makedirs(output_dir, exist_ok=True)
+        self.state_path = os.path.join(output_dir, STATE_FILE)
+        self.state = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                self.state = json.load(f)
+        self.figures = {}
+
+    def _changed(self, name, digest):
+        return self.state.get(name) != digest or not os.path.exists(os.path.join(self.output_dir, name))
+
+    def _save(self, name, fig, digest):
+        fig.tight_layout()
+        fig.savefig(os.path.join(self.output_dir, name))
+        if self.show:
+            fig.canvas.draw_idle()
+        self.state[name] = digest
+        with open(self.state_path, "w") as f:
+            json.dump(self.state, f)
+
+    def _line_chart(self, name, title, ylabel, series):
+        if name not in self.figures:
+            fig, ax = plt.subplots(figsize=(10, 5))
+            artists = []
+            for column, line_style, scatter_style in series:
+                line, = ax.plot([], [], **line_style)
+                artists.append((column, line, ax.scatter([], [], **scatter_style)))
+            ax.set_xlabel("Generation")
+            ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+            ax.set_ylabel(ylabel)
+            ax.set_title(title)
+            if any("label" in line_style for _, line_style, _ in series):
+                ax.legend(loc="upper left")
+            self.figures[name] = (fig, ax, artists)
+        return self.figures[name]
+
+    def update(self, df, species_df):
+        updated = []
+        x = df["generation"].to_numpy()
+        colors = _point_colors(len(df))
+
+        for name, title, ylabel, series in CHARTS:
+            digest = _digest(df[["generation"] + [column for column, _, _ in series]])
+            if not self._changed(name, digest):
+                continue
+            fig, ax, artists = self._line_chart(name, title, ylabel, series)
+            for column, line, points in artists:
+                y = df[column].to_numpy(dtype=float)
+                line.set_data(x, y)
+                points.set_offsets(np.column_stack((x, y)))
+                points.set_color(colors)
+            ax.relim()
+            ax.autoscale_view()
+            self._save(name, fig, digest)
+            updated.append(name)
+
+        # Species sizes: one stacked area per species, stepped like bars
+        digest = _digest(species_df[["generation", "id", "size"]])
+        if self._changed(SPECIES_CHART, digest):
+            if SPECIES_CHART not in self.figures:
+                self.figures[SPECIES_CHART] = plt.subplots(figsize=(12, 5))
+            fig, ax = self.figures[SPECIES_CHART]
+            pivot = species_df.pivot_table(index="generation", columns="id", values="size",
+                                           aggfunc="sum", fill_value=0)
+            ax.clear()
+            if len(pivot.columns):
+                species_colors = matplotlib.colormaps['tab20'](np.linspace(0, 1, len(pivot.columns)))
+                ax.stackplot(pivot.index.to_numpy(), pivot.to_numpy().T, step='mid',
+                             labels=[str(c) for c in pivot.columns], colors=species_colors)
+                if len(pivot.columns) <= MAX_LEGEND_SPECIES:
+                    ax.legend(title="id", fontsize="small", loc="upper left")
+            ax.set_title("Species Size per Generation")
+            ax.set_xlabel("Generation")
+            ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+            ax.set_ylabel("Size")
+            self._save(SPECIES_CHART, fig, digest)
+            updated.append(SPECIES_CHART)
+        return updated
+
+    def close(self):
+        for figure in self.figures.values():
+            plt.close(figure[0])
+        self.figures = {}
+
+
+# Generation and species frames of a stdout log that is still being written;
+# each read() parses only what was appended since the last one
+class LogFrames:
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.rows = []
+        self.species = []
+
+    def read(self):
+        if not os.path.exists(self.path):  # training has not started yet
+            return pd.DataFrame(columns=log_stream.GENERATION_FIELDS), pd.DataFrame()
+        for row, species, offset in log_stream.stream_log(self.path, self.offset):
+            self.rows.append(row)
+            self.species.extend(species)
+            self.offset = offset
+        df = pd.DataFrame(self.rows, columns=log_stream.GENERATION_FIELDS)
+        species_df = pd.DataFrame(self.species, columns=log_stream.SPECIES_FIELDS).apply(
+            pd.to_numeric, errors='coerce').dropna(subset=["size"])
+        return df, species_df
+
+# Live dashboard: polls a metrics run directory or a NEAT stdout log every
+# `interval` seconds and refreshes the charts whose data changed, until
+# interrupted. show=True also displays them in windows.
+def live(source, output_dir, interval=5.0, show=False):
+    if show:
+        plt.ion()
+    dashboard = Dashboard(output_dir, show)
+    read = (lambda: load_run(source)) if os.path.isdir(source) else LogFrames(source).read
+    try:
+        while True:
+            df, species_df = read()
+            if len(df):
+                updated = dashboard.update(df, species_df)
+                if updated:
+                    print(f"Generation {df['generation'].iloc[-1]}: updated {', '.join(updated)}")
+            if show:
+                plt.pause(interval)
+            else:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dashboard.close()
 
 
 if __name__ == "__main__":
-    log_file = "logs.txt"  # 🔁 Replace with your actual log filename
-    gen_csv = "generation_stats.csv"
-    species_csv = "species_data.csv"
-    image_dir = "./images"
-
-    parse_log_file(log_file, gen_csv, species_csv)
-    plot_all(gen_csv, species_csv, image_dir)
+    import argparse
+    parser = argparse.ArgumentParser(description="Plot NEAT training statistics")
+    parser.add_argument("source", nargs="?", help="metrics run directory (runs/run-*) or stdout log; "
+                                                  "default: parse logs.txt into the CSVs and plot those")
+    parser.add_argument("--out", default="./images")
+    parser.add_argument("--live", action="store_true", help="keep updating the charts as training runs")
+    parser.add_argument("--show", action="store_true", help="with --live, also show the charts on screen")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between --live updates")
+    args = parser.parse_args()
+
+    if args.live:
+        live(args.source or "logs.txt", args.out, args.interval, args.show)
+    elif args.source and os.path.isdir(args.source):
+        plot_run(args.source, args.out)
+    else:
+        log_file = args.source or "logs.txt"
+        gen_csv = "generation_stats.csv"
+        species_csv = "species_data.csv"
+
+        parse_log_file(log_file, gen_csv, species_csv)
+        plot_all(gen_csv, species_csv, args.out)